@@ -12,6 +12,7 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
+from collections.abc import Mapping, MutableMapping
 
 logger = logging.getLogger(__name__)
 
@@ -95,7 +96,21 @@ class BaseAgent(ABC):
         if user_id not in self.state:
             self.state[user_id] = {}
         self.state[user_id].update(state_update)
-    
+
+    def update_state_patch(self, state_key: str, patch: Dict[str, Any]):
+        """
+        Merge only the changed sub-fields into an existing state entry.
+        Nested mappings are merged key-by-key, so a single submission or
+        record can be written without re-sending the whole entry.
+        """
+        entry = self.state.setdefault(state_key, {})
+        for field, value in patch.items():
+            current = entry.get(field)
+            if isinstance(current, MutableMapping) and isinstance(value, Mapping):
+                current.update(value)
+            else:
+                entry[field] = value
+
     def clear_state(self, user_id: str):
         """Clear agent state for a specific user"""
         if user_id in self.state:
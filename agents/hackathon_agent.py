@@ -8,14 +8,29 @@ Provides automated scoring, ranking, and challenge generation.
 
 import json
 import logging
+import itertools
+import re
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, FrozenSet, Iterator
 from enum import Enum
+from collections import defaultdict
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field, asdict
+from operator import attrgetter
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; large leaderboards fall back to list.sort
+    np = None
 
 from .base_agent import BaseAgent, AgentEvent
 
 logger = logging.getLogger(__name__)
 
+# Leaderboards larger than this are ranked with a NumPy argsort
+NUMPY_RANK_THRESHOLD = 1000
+
 class HackathonStatus(Enum):
     UPCOMING = "upcoming"
     ACTIVE = "active"
@@ -23,6 +38,142 @@ class HackathonStatus(Enum):
     COMPLETED = "completed"
     CANCELLED = "cancelled"
 
+# Plain string values for status comparisons in hot paths
+_STATUS_UPCOMING = HackathonStatus.UPCOMING.value
+_STATUS_ACTIVE = HackathonStatus.ACTIVE.value
+_STATUS_JUDGING = HackathonStatus.JUDGING.value
+_STATUS_COMPLETED = HackathonStatus.COMPLETED.value
+
+# Requirement keyword categories for _check_requirement
+_REQ_KEYWORDS = {
+    "responsive": frozenset(("responsive", "mobile", "media query")),
+    "database": frozenset(("database", "db", "sql", "mongodb", "postgres")),
+    "authentication": frozenset(("auth", "login", "signup", "user")),
+    "api": frozenset(("api", "endpoint", "rest", "graphql")),
+    "test": frozenset(("test", "testing", "jest", "pytest")),
+}
+
+def _any_of(terms) -> "re.Pattern[str]":
+    """Single-pass pattern reporting every (possibly overlapping) occurrence of terms"""
+    return re.compile("(?=(" + "|".join(re.escape(term) for term in terms) + "))")
+
+# Code-quality indicator -> scoring group, and points per group
+_QUALITY_GROUPS = {
+    "function": "modularity", "def ": "modularity",
+    "class": "oop",
+    "import": "imports",
+    "#": "comments", "//": "comments", "/*": "comments",
+    "try": "error_handling", "catch": "error_handling",
+    "except": "error_handling", "error": "error_handling",
+}
+_QUALITY_POINTS = {
+    "modularity": 10,
+    "oop": 5,
+    "imports": 5,
+    "comments": 10,
+    "error_handling": 10,
+}
+_QUALITY_RE = _any_of(_QUALITY_GROUPS)
+
+# Each distinct innovative term in the description is worth 5 points
+_CREATIVITY_RE = _any_of((
+    "unique", "innovative", "creative", "original", "novel",
+    "ai", "machine learning", "automation", "real-time",
+    "visualization", "analytics", "dashboard"
+))
+
+# Each distinct documentation indicator is worth 10 points
+_DOC_RE = _any_of((
+    "installation", "setup", "usage", "features",
+    "requirements", "dependencies", "api", "examples"
+))
+
+def _aggregate_score(requirements_score: float, code_quality_score: float,
+                     creativity_score: float, documentation_score: float,
+                     max_score: int) -> int:
+    """Weighted automated score for a submission, capped at max_score"""
+    total_score = (
+        requirements_score +
+        code_quality_score * 0.3 +
+        creativity_score * 0.2 +
+        documentation_score * 0.1
+    )
+    return min(int(total_score), max_score)
+
+def _combine(automated_score: float, manual_sum: float, manual_count: int) -> float:
+    """Blend automated score (60%) with the average manual score (40%)"""
+    if not manual_count:
+        return automated_score
+    return automated_score * 0.6 + (manual_sum / manual_count) * 0.4
+
+@dataclass(slots=True)
+class Participant:
+    """Registered hackathon participant"""
+    user_id: str
+    team_name: str
+    joined_at: str
+    submission_status: str = "not_submitted"
+    submission_time: Optional[str] = None
+
+@dataclass(slots=True)
+class Submission:
+    """Hackathon submission with its automated and manual evaluation"""
+    user_id: str
+    team_name: str
+    submission_data: Dict[str, Any]
+    submitted_at: str
+    evaluation_status: str = "pending"
+    score: float = 0
+    max_score: int = 100
+    feedback: List[str] = field(default_factory=list)
+    score_breakdown: Dict[str, float] = field(default_factory=dict)
+    final_score: Optional[float] = None
+    manual_scores: Optional[Dict[str, float]] = None
+    judge_feedback: Optional[str] = None
+
+@dataclass(slots=True)
+class LeaderboardEntry:
+    """Ranked leaderboard row"""
+    user_id: str
+    team_name: str
+    score: float
+    submitted_at: str
+    evaluation_status: str
+    rank: int = 0
+
+class SpilledSubmissions(MutableMapping):
+    """
+    Read-through view over a completed hackathon's submissions after they
+    have been spooled to an external key-value store (Redis or anything
+    exposing get/set). Only the user ids stay in memory; each submission
+    is fetched on access and written back on assignment.
+    """
+    
+    def __init__(self, store, hackathon_id: str, user_ids):
+        self._store = store
+        self._key_prefix = f"hx:{hackathon_id}:subs:"
+        self._user_ids = set(user_ids)
+    
+    def __getitem__(self, user_id: str) -> Submission:
+        raw = self._store.get(self._key_prefix + user_id) if user_id in self._user_ids else None
+        if raw is None:
+            raise KeyError(user_id)
+        return Submission(**json.loads(raw))
+    
+    def __setitem__(self, user_id: str, submission: Submission):
+        self._store.set(self._key_prefix + user_id, json.dumps(asdict(submission)))
+        self._user_ids.add(user_id)
+    
+    def __delitem__(self, user_id: str):
+        self._user_ids.remove(user_id)
+        self._store.delete(self._key_prefix + user_id)
+    
+    def __iter__(self):
+        return iter(self._user_ids)
+    
+    def __len__(self) -> int:
+        return len(self._user_ids)
+
 class HackathonAgent(BaseAgent):
     """
     Hackathon Agent manages coding competitions and challenges.
@@ -35,9 +186,13 @@ class HackathonAgent(BaseAgent):
     - Judge dashboard and manual review system
     """
     
-    def __init__(self, event_bus=None):
+    def __init__(self, event_bus=None, submission_store=None):
         super().__init__("HackathonAgent", event_bus)
         
+        # Optional key-value store (get/set/delete, e.g. redis.Redis) that
+        # completed hackathons spool their submissions to
+        self._submission_store = submission_store
+        
         # Subscribe to events
         self.subscribe_to_event("hackathon.create_requested")
         self.subscribe_to_event("hackathon.submission_made")
@@ -139,6 +294,19 @@ class HackathonAgent(BaseAgent):
         # Active hackathons storage
         self.active_hackathons = {}
         
+        # Process-local sequence that keeps same-nanosecond ids distinct
+        self._id_counter = itertools.count()
+        
+        # Reverse index: user_id -> ids of hackathons the user joined
+        self._user_to_hackathons: Dict[str, Set[str]] = defaultdict(set)
+        
+        # Rank index: hackathon_id -> user_id -> leaderboard entry; kept out
+        # of the hackathon dict so it never reaches state or responses
+        self._leaderboard_by_user: Dict[str, Dict[str, LeaderboardEntry]] = defaultdict(dict)
+        
+        # Submissions still awaiting evaluation, per hackathon_id
+        self._pending_evaluations: Dict[str, int] = defaultdict(int)
+        
         # Scoring weights for different aspects
         self.scoring_weights = {
             "automated_tests": 0.4,
@@ -185,7 +353,7 @@ class HackathonAgent(BaseAgent):
             return {"error": f"No challenges available for theme: {theme}, difficulty: {difficulty}"}
         
         # Create hackathon instance
-        hackathon_id = f"hackathon_{theme}_{int(datetime.utcnow().timestamp())}"
+        hackathon_id = f"hackathon_{theme}_{time.time_ns()}_{next(self._id_counter)}"
         
         hackathon = {
             "id": hackathon_id,
@@ -196,7 +364,7 @@ class HackathonAgent(BaseAgent):
             "challenge": challenge,
             "duration_hours": duration_hours,
             "max_participants": max_participants,
-            "status": HackathonStatus.UPCOMING.value,
+            "status": _STATUS_UPCOMING,
             "created_by": user_id,
             "created_at": datetime.utcnow().isoformat(),
             "start_time": start_time or (datetime.utcnow() + timedelta(hours=1)).isoformat(),
@@ -210,14 +378,15 @@ class HackathonAgent(BaseAgent):
         self.active_hackathons[hackathon_id] = hackathon
         self.update_state(hackathon_id, hackathon)
         
-        # Emit hackathon created event
+        # Emit hackathon created event; the payload is a snapshot, since the
+        # live dict later holds records and possibly spooled submissions
         self.emit_event(
             "hackathon.created",
             None,
             user_id,
             {
                 "hackathon_id": hackathon_id,
-                "hackathon": hackathon,
+                "hackathon": self._serialize_hackathon(hackathon),
                 "registration_open": True
             }
         )
@@ -225,7 +394,7 @@ class HackathonAgent(BaseAgent):
         return {
             "status": "hackathon_created",
             "hackathon_id": hackathon_id,
-            "hackathon": hackathon
+            "hackathon": self._serialize_hackathon(hackathon)
         }
     
     def _handle_join_request(self, event: AgentEvent) -> Dict[str, Any]:
@@ -241,7 +410,7 @@ class HackathonAgent(BaseAgent):
             return {"error": "Hackathon not found"}
         
         # Check if hackathon is accepting participants
-        if hackathon["status"] != HackathonStatus.UPCOMING.value:
+        if hackathon["status"] != _STATUS_UPCOMING:
             return {"error": "Hackathon is not accepting new participants"}
         
         # Check participant limit
@@ -249,20 +418,19 @@ class HackathonAgent(BaseAgent):
             return {"error": "Hackathon is full"}
         
         # Check if user already joined
-        if user_id in [p["user_id"] for p in hackathon["participants"]]:
+        if hackathon_id in self._user_to_hackathons.get(user_id, ()):
             return {"error": "Already registered for this hackathon"}
         
         # Add participant
-        participant = {
-            "user_id": user_id,
-            "team_name": team_name,
-            "joined_at": datetime.utcnow().isoformat(),
-            "submission_status": "not_submitted"
-        }
+        participant = Participant(
+            user_id=user_id,
+            team_name=team_name,
+            joined_at=datetime.utcnow().isoformat()
+        )
         
+        # State shares this participants list, so the append needs no patch
         hackathon["participants"].append(participant)
-        self.active_hackathons[hackathon_id] = hackathon
-        self.update_state(hackathon_id, hackathon)
+        self._user_to_hackathons[user_id].add(hackathon_id)
         
         # Emit participant joined event
         self.emit_event(
@@ -295,7 +463,7 @@ class HackathonAgent(BaseAgent):
             return {"error": "Hackathon not found"}
         
         # Check if user is participant
-        participant = next((p for p in hackathon["participants"] if p["user_id"] == user_id), None)
+        participant = next((p for p in hackathon["participants"] if p.user_id == user_id), None)
         if not participant:
             return {"error": "Not registered for this hackathon"}
         
@@ -311,32 +479,42 @@ class HackathonAgent(BaseAgent):
             return {"error": "Hackathon submission deadline has passed"}
         
         # Process submission
-        submission = {
-            "user_id": user_id,
-            "team_name": participant["team_name"],
-            "submission_data": submission_data,
-            "submitted_at": datetime.utcnow().isoformat(),
-            "evaluation_status": "pending",
-            "score": 0,
-            "feedback": []
-        }
+        submission = Submission(
+            user_id=user_id,
+            team_name=participant.team_name,
+            submission_data=submission_data,
+            submitted_at=datetime.utcnow().isoformat()
+        )
         
         # Evaluate submission
         evaluation_result = self._evaluate_submission(submission, hackathon["challenge"])
-        submission.update(evaluation_result)
-        
-        # Store submission
+        submission.score = evaluation_result["score"]
+        submission.max_score = evaluation_result["max_score"]
+        submission.feedback = evaluation_result["feedback"]
+        submission.score_breakdown = evaluation_result["score_breakdown"]
+        submission.evaluation_status = evaluation_result["evaluation_status"]
+        
+        # Track submissions still awaiting evaluation (a resubmission
+        # replaces the user's previous one)
+        previous = hackathon["submissions"].get(user_id)
+        if previous is not None and previous.evaluation_status != "completed":
+            self._pending_evaluations[hackathon_id] -= 1
+        if submission.evaluation_status != "completed":
+            self._pending_evaluations[hackathon_id] += 1
+        
+        # Store submission (state shares the submissions mapping)
         hackathon["submissions"][user_id] = submission
         
         # Update participant status
-        participant["submission_status"] = "submitted"
-        participant["submission_time"] = submission["submitted_at"]
+        participant.submission_status = "submitted"
+        participant.submission_time = submission.submitted_at
         
-        # Update leaderboard
+        # Update leaderboard; it is rebuilt as a new list, so state needs the patch
         self._update_leaderboard(hackathon_id, submission)
         
-        self.active_hackathons[hackathon_id] = hackathon
-        self.update_state(hackathon_id, hackathon)
+        self.update_state_patch(hackathon_id, {"leaderboard": hackathon["leaderboard"]})
+        
+        rank = self._get_user_rank(hackathon_id, user_id)
         
         # Emit submission received event
         self.emit_event(
@@ -345,16 +523,16 @@ class HackathonAgent(BaseAgent):
             user_id,
             {
                 "hackathon_id": hackathon_id,
-                "score": submission["score"],
-                "rank": self._get_user_rank(hackathon_id, user_id)
+                "score": submission.score,
+                "rank": rank
             }
         )
         
         return {
             "status": "submission_received",
-            "score": submission["score"],
-            "feedback": submission["feedback"],
-            "rank": self._get_user_rank(hackathon_id, user_id)
+            "score": submission.score,
+            "feedback": submission.feedback,
+            "rank": rank
         }
     
     def _handle_evaluation_completed(self, event: AgentEvent) -> Dict[str, Any]:
@@ -373,21 +551,24 @@ class HackathonAgent(BaseAgent):
         submission = hackathon["submissions"][user_id]
         
         # Combine automated and manual scores
-        final_score = self._combine_scores(submission["score"], manual_scores)
+        final_score = self._combine_scores(submission.score, manual_scores)
+        
+        if submission.evaluation_status != "completed":
+            self._pending_evaluations[hackathon_id] -= 1
         
         # Update submission
-        submission.update({
-            "final_score": final_score,
-            "manual_scores": manual_scores,
-            "judge_feedback": judge_feedback,
-            "evaluation_status": "completed"
-        })
+        submission.final_score = final_score
+        submission.manual_scores = manual_scores
+        submission.judge_feedback = judge_feedback
+        submission.evaluation_status = "completed"
+        # Write back in case submissions were spooled to the external store;
+        # state shares this mapping, so it is not patched again below
+        hackathon["submissions"][user_id] = submission
         
         # Update leaderboard with final scores
         self._update_leaderboard(hackathon_id, submission, use_final_score=True)
         
-        self.active_hackathons[hackathon_id] = hackathon
-        self.update_state(hackathon_id, hackathon)
+        self.update_state_patch(hackathon_id, {"leaderboard": hackathon["leaderboard"]})
         
         return {
             "status": "evaluation_completed",
@@ -403,10 +584,10 @@ class HackathonAgent(BaseAgent):
                 return random.choice(templates).copy()
         return None
     
-    def _evaluate_submission(self, submission: Dict[str, Any], 
+    def _evaluate_submission(self, submission: Submission, 
                            challenge: Dict[str, Any]) -> Dict[str, Any]:
         """Evaluate hackathon submission automatically"""
-        submission_data = submission.get("submission_data", {})
+        submission_data = submission.submission_data or {}
         
         # Initialize evaluation
         evaluation = {
@@ -421,9 +602,15 @@ class HackathonAgent(BaseAgent):
         requirements = challenge.get("requirements", [])
         requirements_met = 0
         
-        for i, requirement in enumerate(requirements):
+        # Lowercase description and code once; every check below reads these
+        code_files = submission_data.get("code_files", {})
+        description_lower = submission_data.get("description", "").lower()
+        code_lower = "\n".join(str(code) for code in code_files.values()).lower()
+        submission_text = description_lower + "\n" + code_lower
+        
+        for requirement in requirements:
             # Simplified requirement checking based on submission content
-            requirement_met = self._check_requirement(submission_data, requirement)
+            requirement_met = self._check_requirement(submission_text, requirement, bool(code_files))
             if requirement_met:
                 requirements_met += 1
                 evaluation["feedback"].append(f"✓ {requirement}")
@@ -435,137 +622,86 @@ class HackathonAgent(BaseAgent):
         evaluation["score_breakdown"]["requirements"] = requirements_score
         
         # Evaluate code quality (simplified)
-        code_quality_score = self._evaluate_code_quality(submission_data)
+        code_quality_score = self._evaluate_code_quality(code_lower if code_files else None)
         evaluation["score_breakdown"]["code_quality"] = code_quality_score
         
         # Evaluate creativity/innovation
-        creativity_score = self._evaluate_creativity(submission_data)
+        creativity_score = self._evaluate_creativity(description_lower, submission_data.get("features", []))
         evaluation["score_breakdown"]["creativity"] = creativity_score
         
         # Evaluate documentation
-        documentation_score = self._evaluate_documentation(submission_data)
+        documentation_score = self._evaluate_documentation(submission_data.get("readme", ""), description_lower)
         evaluation["score_breakdown"]["documentation"] = documentation_score
         
         # Calculate total score
-        total_score = (
-            requirements_score + 
-            code_quality_score * 0.3 + 
-            creativity_score * 0.2 + 
-            documentation_score * 0.1
+        evaluation["score"] = _aggregate_score(
+            requirements_score, code_quality_score, creativity_score,
+            documentation_score, evaluation["max_score"]
         )
         
-        evaluation["score"] = min(int(total_score), evaluation["max_score"])
-        
         # Time bonus (submitted early)
-        submitted_time = datetime.fromisoformat(submission["submitted_at"])
+        submitted_time = datetime.fromisoformat(submission.submitted_at)
         if "early_submission_bonus" not in evaluation:
             # Add time-based bonus logic here if needed
             pass
         
         return evaluation
     
-    def _check_requirement(self, submission_data: Dict[str, Any], requirement: str) -> bool:
-        """Check if submission meets a specific requirement"""
+    def _check_requirement(self, submission_text: str, requirement: str,
+                           has_code: bool) -> bool:
+        """
+        Check if submission meets a specific requirement.
+        submission_text is the lowercased description and code files.
+        """
         # Simplified requirement checking
         requirement_lower = requirement.lower()
         
-        # Check based on submission content
-        description = submission_data.get("description", "").lower()
-        code_files = submission_data.get("code_files", {})
-        
         # Basic keyword matching for requirements
-        keywords = {
-            "responsive": ["responsive", "mobile", "media query"],
-            "database": ["database", "db", "sql", "mongodb", "postgres"],
-            "authentication": ["auth", "login", "signup", "user"],
-            "api": ["api", "endpoint", "rest", "graphql"],
-            "test": ["test", "testing", "jest", "pytest"],
-        }
-        
-        for key, terms in keywords.items():
+        for key, terms in _REQ_KEYWORDS.items():
             if key in requirement_lower:
-                return any(term in description or 
-                          any(term in str(code).lower() for code in code_files.values()) 
-                          for term in terms)
+                return any(term in submission_text for term in terms)
         
         # Default to basic check
-        return len(submission_data.get("code_files", {})) > 0
+        return has_code
     
-    def _evaluate_code_quality(self, submission_data: Dict[str, Any]) -> float:
-        """Evaluate code quality of submission"""
-        code_files = submission_data.get("code_files", {})
-        if not code_files:
+    def _evaluate_code_quality(self, total_code: Optional[str]) -> float:
+        """
+        Evaluate code quality of submission.
+        total_code is the lowercased code files, or None if none were submitted.
+        """
+        if total_code is None:
             return 0.0
         
         quality_score = 50.0  # Base score
         
-        # Check for good practices
-        total_code = " ".join(str(code) for code in code_files.values()).lower()
-        
-        # Positive indicators
-        if "function" in total_code or "def " in total_code:
-            quality_score += 10  # Functions/modularity
-        
-        if "class" in total_code:
-            quality_score += 5   # OOP
-        
-        if "import" in total_code:
-            quality_score += 5   # External libraries
-        
-        # Check for comments
-        if "#" in total_code or "//" in total_code or "/*" in total_code:
-            quality_score += 10  # Documentation
-        
-        # Check for error handling
-        if any(term in total_code for term in ["try", "catch", "except", "error"]):
-            quality_score += 10  # Error handling
+        # Positive indicators: modularity, OOP, imports, comments, error handling
+        groups = {_QUALITY_GROUPS[term] for term in _QUALITY_RE.findall(total_code)}
+        quality_score += sum(_QUALITY_POINTS[group] for group in groups)
         
         return min(quality_score, 100.0)
     
-    def _evaluate_creativity(self, submission_data: Dict[str, Any]) -> float:
-        """Evaluate creativity and innovation"""
-        description = submission_data.get("description", "").lower()
-        features = submission_data.get("features", [])
-        
+    def _evaluate_creativity(self, description: str, features: List[Any]) -> float:
+        """Evaluate creativity and innovation from the lowercased description"""
         creativity_score = 30.0  # Base score
         
         # Check for innovative features
-        innovative_terms = [
-            "unique", "innovative", "creative", "original", "novel",
-            "ai", "machine learning", "automation", "real-time",
-            "visualization", "analytics", "dashboard"
-        ]
-        
-        for term in innovative_terms:
-            if term in description:
-                creativity_score += 5
+        creativity_score += 5 * len(set(_CREATIVITY_RE.findall(description)))
         
         # Bonus for additional features
         creativity_score += min(len(features) * 5, 20)
         
         return min(creativity_score, 100.0)
     
-    def _evaluate_documentation(self, submission_data: Dict[str, Any]) -> float:
-        """Evaluate documentation quality"""
-        readme = submission_data.get("readme", "")
-        description = submission_data.get("description", "")
-        
+    def _evaluate_documentation(self, readme: str, description: str) -> float:
+        """Evaluate documentation quality (description is already lowercased)"""
         if not readme and not description:
             return 0.0
         
         doc_score = 20.0  # Base score for having documentation
         
         # Check documentation quality
-        combined_docs = (readme + " " + description).lower()
-        
-        quality_indicators = [
-            "installation", "setup", "usage", "features",
-            "requirements", "dependencies", "api", "examples"
-        ]
-        
-        for indicator in quality_indicators:
-            if indicator in combined_docs:
-                doc_score += 10
+        combined_docs = readme.lower() + " " + description
+        doc_score += 10 * len(set(_DOC_RE.findall(combined_docs)))
         
         return min(doc_score, 100.0)
     
@@ -575,57 +711,57 @@ class HackathonAgent(BaseAgent):
             return automated_score
         
         # Weighted combination
-        automated_weight = 0.6
-        manual_weight = 0.4
-        
-        manual_average = sum(manual_scores.values()) / len(manual_scores)
-        
-        return automated_score * automated_weight + manual_average * manual_weight
+        return _combine(automated_score, sum(manual_scores.values()), len(manual_scores))
     
-    def _update_leaderboard(self, hackathon_id: str, submission: Dict[str, Any], 
+    def _update_leaderboard(self, hackathon_id: str, submission: Submission, 
                           use_final_score: bool = False):
         """Update hackathon leaderboard"""
         hackathon = self.active_hackathons.get(hackathon_id)
         if not hackathon:
             return
         
-        score_field = "final_score" if use_final_score and "final_score" in submission else "score"
+        if use_final_score and submission.final_score is not None:
+            score = submission.final_score
+        else:
+            score = submission.score
         
         # Remove existing entry for this user
         hackathon["leaderboard"] = [
             entry for entry in hackathon["leaderboard"] 
-            if entry["user_id"] != submission["user_id"]
+            if entry.user_id != submission.user_id
         ]
         
         # Add new entry
-        leaderboard_entry = {
-            "user_id": submission["user_id"],
-            "team_name": submission["team_name"],
-            "score": submission[score_field],
-            "submitted_at": submission["submitted_at"],
-            "evaluation_status": submission.get("evaluation_status", "completed")
-        }
+        leaderboard_entry = LeaderboardEntry(
+            user_id=submission.user_id,
+            team_name=submission.team_name,
+            score=score,
+            submitted_at=submission.submitted_at,
+            evaluation_status=submission.evaluation_status
+        )
         
         hackathon["leaderboard"].append(leaderboard_entry)
         
-        # Sort by score descending
-        hackathon["leaderboard"].sort(key=lambda x: x["score"], reverse=True)
+        # Sort by score descending (stable, so ties keep submission order)
+        leaderboard = hackathon["leaderboard"]
+        if np is not None and len(leaderboard) > NUMPY_RANK_THRESHOLD:
+            scores = np.fromiter((entry.score for entry in leaderboard),
+                                 dtype=np.float64, count=len(leaderboard))
+            order = np.argsort(-scores, kind="stable")
+            leaderboard[:] = [leaderboard[i] for i in order.tolist()]
+        else:
+            leaderboard.sort(key=attrgetter("score"), reverse=True)
         
-        # Add ranks
+        # Add ranks and index entries by user for O(1) rank lookups
+        leaderboard_by_user = self._leaderboard_by_user[hackathon_id]
         for i, entry in enumerate(hackathon["leaderboard"]):
-            entry["rank"] = i + 1
+            entry.rank = i + 1
+            leaderboard_by_user[entry.user_id] = entry
     
     def _get_user_rank(self, hackathon_id: str, user_id: str) -> Optional[int]:
         """Get user's current rank in hackathon"""
-        hackathon = self.active_hackathons.get(hackathon_id)
-        if not hackathon:
-            return None
-        
-        for entry in hackathon["leaderboard"]:
-            if entry["user_id"] == user_id:
-                return entry["rank"]
-        
-        return None
+        entry = self._leaderboard_by_user.get(hackathon_id, {}).get(user_id)
+        return entry.rank if entry else None
     
     def get_hackathon_status(self, hackathon_id: str) -> Dict[str, Any]:
         """Get current status of a hackathon"""
@@ -639,47 +775,103 @@ class HackathonAgent(BaseAgent):
         
         # Update status based on time
         if current_time < start_time:
-            status = HackathonStatus.UPCOMING.value
+            status = _STATUS_UPCOMING
         elif current_time <= end_time:
-            status = HackathonStatus.ACTIVE.value
+            status = _STATUS_ACTIVE
         else:
             # Check if all submissions are evaluated
-            all_evaluated = all(
-                sub.get("evaluation_status") == "completed" 
-                for sub in hackathon["submissions"].values()
-            )
-            status = HackathonStatus.COMPLETED.value if all_evaluated else HackathonStatus.JUDGING.value
+            all_evaluated = self._pending_evaluations.get(hackathon_id, 0) == 0
+            status = _STATUS_COMPLETED if all_evaluated else _STATUS_JUDGING
         
         hackathon["status"] = status
         
+        if status == _STATUS_COMPLETED:
+            self._spill_submissions(hackathon_id, hackathon)
+        
         return {
-            "hackathon": hackathon,
-            "time_remaining": max(0, (end_time - current_time).total_seconds()) if status == HackathonStatus.ACTIVE.value else 0,
+            "hackathon": self._serialize_hackathon(hackathon),
+            "time_remaining": max(0, (end_time - current_time).total_seconds()) if status == _STATUS_ACTIVE else 0,
             "submissions_count": len(hackathon["submissions"]),
             "participants_count": len(hackathon["participants"])
         }
     
-    def get_user_hackathons(self, user_id: str) -> List[Dict[str, Any]]:
-        """Get hackathons user has participated in"""
-        user_hackathons = []
-        
-        for hackathon in self.active_hackathons.values():
-            # Check if user is participant
-            if user_id in [p["user_id"] for p in hackathon["participants"]]:
-                user_hackathons.append({
-                    "hackathon_id": hackathon["id"],
-                    "title": hackathon["title"],
-                    "status": hackathon["status"],
-                    "theme": hackathon["theme"],
-                    "difficulty": hackathon["difficulty"],
-                    "start_time": hackathon["start_time"],
-                    "end_time": hackathon["end_time"],
-                    "submission_status": hackathon["submissions"].get(user_id, {}).get("evaluation_status", "not_submitted"),
-                    "score": hackathon["submissions"].get(user_id, {}).get("score", 0),
-                    "rank": self._get_user_rank(hackathon["id"], user_id)
-                })
-        
-        return user_hackathons
+    def _serialize_hackathon(self, hackathon: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Plain-dict copy of a hackathon with its records converted via asdict.
+        Submissions spooled to the external store are listed by user id only
+        (the leaderboard still carries their scores), so a status poll never
+        fetches them back one by one.
+        """
+        leaderboard = [asdict(entry) for entry in hackathon["leaderboard"]]
+        submissions = hackathon["submissions"]
+        if isinstance(submissions, SpilledSubmissions):
+            serialized_submissions = {}
+            spilled_ids = sorted(submissions)
+        else:
+            serialized_submissions = {
+                user_id: asdict(submission)
+                for user_id, submission in submissions.items()
+            }
+            spilled_ids = []
+        return dict(
+            hackathon,
+            participants=[asdict(p) for p in hackathon["participants"]],
+            submissions=serialized_submissions,
+            spilled_submission_ids=spilled_ids,
+            leaderboard=leaderboard
+        )
+    
+    def _spill_submissions(self, hackathon_id: str, hackathon: Dict[str, Any]):
+        """Move a completed hackathon's submissions to the external store"""
+        submissions = hackathon["submissions"]
+        if self._submission_store is None or isinstance(submissions, SpilledSubmissions):
+            return
+        
+        spilled = SpilledSubmissions(self._submission_store, hackathon_id, ())
+        for user_id, submission in submissions.items():
+            spilled[user_id] = submission
+        
+        hackathon["submissions"] = spilled
+        self.update_state(hackathon_id, {"submissions": spilled})
+    
+    def get_user_hackathons(self, user_id: str,
+                            fields: Optional[FrozenSet[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield hackathons user has participated in.
+        When fields is given, only those keys are built, so the submission
+        lookup and rank resolution are skipped unless requested.
+        """
+        def wanted(name: str) -> bool:
+            return fields is None or name in fields
+        
+        for hackathon_id in self._user_to_hackathons.get(user_id, ()):
+            hackathon = self.active_hackathons.get(hackathon_id)
+            if not hackathon:
+                continue
+            
+            result = {
+                "hackathon_id": hackathon["id"],
+                "title": hackathon["title"],
+                "status": hackathon["status"],
+                "theme": hackathon["theme"],
+                "difficulty": hackathon["difficulty"],
+                "start_time": hackathon["start_time"],
+                "end_time": hackathon["end_time"]
+            }
+            if fields is not None:
+                result = {key: value for key, value in result.items() if key in fields}
+            
+            if wanted("submission_status") or wanted("score"):
+                submission = hackathon["submissions"].get(user_id)
+                if wanted("submission_status"):
+                    result["submission_status"] = submission.evaluation_status if submission else "not_submitted"
+                if wanted("score"):
+                    result["score"] = submission.score if submission else 0
+            
+            if wanted("rank"):
+                result["rank"] = self._get_user_rank(hackathon_id, user_id)
+            
+            yield result
     
     def get_capabilities(self) -> Dict[str, Any]:
         """Return agent capabilities"""
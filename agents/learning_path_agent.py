@@ -6,15 +6,299 @@ Generates personalized learning curricula and manages learning progress.
 Creates adaptive learning experiences based on user skills and goals.
 """
 
+import heapq
+import itertools
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+import re
+import secrets
+import time
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Deque, FrozenSet, Iterator, Mapping, Tuple
 
 from .base_agent import BaseAgent, AgentEvent
 
 logger = logging.getLogger(__name__)
 
+# Recommendations returned per request
+MAX_RECOMMENDATIONS = 5
+
+# Hops walked from a skill when collecting candidate curricula:
+# skill -> curriculum, then curriculum -> prerequisite skill -> curriculum
+CANDIDATE_DEPTH = 2
+
+# Raw completion records kept per user; older history survives only in the aggregates
+MAX_COMPLETED_MODULES = 500
+# Days of per-day completion counts kept for streaks
+COMPLETION_DAYS_RETAINED = 90
+
+# Word tokens used to index curriculum titles and descriptions
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+# Last formatted timestamp, reused for every call within the same millisecond
+_LAST_MS = 0
+_LAST_STR = ""
+
+def _iso_now() -> str:
+    """Current UTC time as a naive ISO string, formatted at most once per millisecond"""
+    global _LAST_MS, _LAST_STR
+    ms = time.time_ns() // 1_000_000
+    if ms != _LAST_MS:
+        _LAST_STR = datetime.utcfromtimestamp(ms / 1000).isoformat(timespec="milliseconds")
+        _LAST_MS = ms
+    return _LAST_STR
+
+@lru_cache(maxsize=512)
+def _parse_iso_date(day: str) -> date:
+    """Parse a YYYY-MM-DD string; completions on the same day share one parse"""
+    return date.fromisoformat(day)
+
+def _module_skill(module_id: Optional[str]) -> Optional[str]:
+    """Skill a completed module counts towards, from its id (simplified)"""
+    module_id = (module_id or "").lower()
+    if "python" in module_id:
+        return "python"
+    if "javascript" in module_id:
+        return "javascript"
+    return None
+
+def _freeze_module(module: Dict[str, Any]) -> Mapping[str, Any]:
+    """Read-only view of a shared module, with list fields stored as tuples"""
+    return MappingProxyType({
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in module.items()
+    })
+
+# Static module catalogs for personalized paths, keyed by skill area (frozen; callers copy)
+_FOUNDATIONAL_MODULES: Dict[str, Tuple[Mapping[str, Any], ...]] = {
+    "python": (
+        _freeze_module({
+            "title": "Python Basics Review",
+            "description": "Strengthen Python fundamentals",
+            "duration_hours": 8,
+            "topics": ["syntax", "variables", "basic_operations"],
+            "exercises": 10
+        }),
+    ),
+    "javascript": (
+        _freeze_module({
+            "title": "JavaScript Fundamentals",
+            "description": "Core JavaScript concepts and syntax",
+            "duration_hours": 10,
+            "topics": ["variables", "functions", "objects", "arrays"],
+            "exercises": 12
+        }),
+    )
+}
+
+_INTERMEDIATE_MODULES: Dict[str, Tuple[Mapping[str, Any], ...]] = {
+    "python": (
+        _freeze_module({
+            "title": "Advanced Python Concepts",
+            "description": "Object-oriented programming and advanced features",
+            "duration_hours": 12,
+            "topics": ["oop", "decorators", "generators", "context_managers"],
+            "exercises": 15
+        }),
+    ),
+    "javascript": (
+        _freeze_module({
+            "title": "Modern JavaScript",
+            "description": "ES6+ features and async programming",
+            "duration_hours": 15,
+            "topics": ["arrow_functions", "promises", "async_await", "modules"],
+            "exercises": 18
+        }),
+    )
+}
+
+_INTERVIEW_GOALS = frozenset({"job interview", "interview prep"})
+
+_INTERVIEW_PREP_MODULE: Mapping[str, Any] = _freeze_module({
+    "title": "Technical Interview Preparation",
+    "description": "Practice coding interviews and system design",
+    "duration_hours": 15,
+    "topics": ["interview_practice", "system_design", "behavioral_questions"],
+    "exercises": 20
+})
+
+@lru_cache(maxsize=64)
+def _build_personalized_modules(skill_levels: Tuple[Tuple[str, str], ...]) -> Tuple[Mapping[str, Any], ...]:
+    """
+    Modules for a personalized path: foundational modules for beginner
+    skills, then intermediate modules for intermediate skills. Depends only
+    on the (skill, level) pairs, so repeated assessment shapes share one result.
+    """
+    # Single pass over the pairs; foundational modules still precede intermediate ones
+    foundational = []
+    intermediate = []
+    for skill, level in skill_levels:
+        if level == "beginner":
+            foundational.append(_FOUNDATIONAL_MODULES.get(skill, ()))
+        elif level == "intermediate":
+            intermediate.append(_INTERMEDIATE_MODULES.get(skill, ()))
+    return tuple(chain.from_iterable(chain(foundational, intermediate)))
+
+@dataclass(slots=True)
+class CustomizedPath:
+    """
+    User-specific learning path stored as a delta over a shared curriculum
+    template. The template is never copied or mutated; full module dicts
+    are only built when the path is materialized for output.
+    """
+    id: str
+    template: Mapping[str, Any]
+    time_commitment: int
+    learning_goals: List[str]
+    created_at: str
+    duration_factor: float = 1.0
+    module_overrides: Dict[str, Any] = field(default_factory=dict)
+    extra_modules: List[Mapping[str, Any]] = field(default_factory=list)
+    total_hours: int = 0
+    
+    @property
+    def total_modules(self) -> int:
+        return len(self.template.get("modules", ())) + len(self.extra_modules)
+    
+    def _customize(self, module: Mapping[str, Any]) -> Dict[str, Any]:
+        """This user's own copy of a shared template module, with overrides applied"""
+        if not self.module_overrides:
+            return dict(module)
+        return dict(module,
+                    duration_hours=int(module.get("duration_hours", 5) * self.duration_factor),
+                    **self.module_overrides)
+    
+    def sum_hours(self) -> int:
+        """Total customized module hours, without materializing module dicts"""
+        template_modules = self.template.get("modules", ())
+        if self.module_overrides:
+            template_hours = sum(int(module.get("duration_hours", 5) * self.duration_factor)
+                                 for module in template_modules)
+        else:
+            template_hours = sum(module.get("duration_hours", 5) for module in template_modules)
+        return template_hours + sum(module.get("duration_hours", 5) for module in self.extra_modules)
+    
+    def iter_modules(self) -> Iterator[Dict[str, Any]]:
+        """Yield customized template modules, then extra modules"""
+        for module in self.template.get("modules", ()):
+            yield self._customize(module)
+        for module in self.extra_modules:
+            yield dict(module)
+    
+    def module_at(self, index: int) -> Dict[str, Any]:
+        """Materialize a single module by position"""
+        base_count = len(self.template.get("modules", ()))
+        if index >= base_count:
+            return dict(self.extra_modules[index - base_count])
+        return self._customize(self.template["modules"][index])
+    
+    def materialize(self) -> Dict[str, Any]:
+        """Full path dict for responses and dashboards"""
+        return {
+            "id": self.id,
+            "title": self.template.get("title", "Custom Learning Path"),
+            "description": self.template.get("description", ""),
+            "modules": list(self.iter_modules()),
+            "time_commitment": self.time_commitment,
+            "learning_goals": self.learning_goals,
+            "customized": True,
+            "created_at": self.created_at
+        }
+
+@dataclass(slots=True)
+class PathProgress:
+    """Progress record for one active path"""
+    status: str
+    completed_modules: int
+    total_modules: int
+    start_date: str
+    estimated_completion: str
+    completion_date: Optional[str] = None
+    last_updated: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+    
+    def update(self, changes: Mapping[str, Any], **kwargs):
+        """Apply client progress fields; unknown keys are kept in extra"""
+        for key, value in (*changes.items(), *kwargs.items()):
+            if key != "extra" and key in PathProgress.__dataclass_fields__:
+                setattr(self, key, value)
+            else:
+                self.extra[key] = value
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Progress dict for responses, omitting fields that were never set"""
+        data = {
+            "status": self.status,
+            "completed_modules": self.completed_modules,
+            "total_modules": self.total_modules,
+            "start_date": self.start_date,
+            "estimated_completion": self.estimated_completion
+        }
+        if self.completion_date is not None:
+            data["completion_date"] = self.completion_date
+        if self.last_updated is not None:
+            data["last_updated"] = self.last_updated
+        data.update(self.extra)
+        return data
+
+@dataclass(slots=True)
+class LearningState:
+    """Per-user learning state held in the agent's state store"""
+    user_id: str
+    created_at: str
+    extracted_skills: Dict[str, List[str]] = field(default_factory=dict)
+    skill_vector: Dict[str, float] = field(default_factory=dict)
+    recommendations: List[Dict[str, Any]] = field(default_factory=list)
+    active_paths: List[CustomizedPath] = field(default_factory=list)
+    completed_modules: Deque[Dict[str, Any]] = field(
+        default_factory=lambda: deque(maxlen=MAX_COMPLETED_MODULES))
+    progress: Dict[str, PathProgress] = field(default_factory=dict)
+    completed_count: int = 0
+    total_completion_time: int = 0
+    total_score_sum: int = 0
+    completions_by_day: Dict[date, int] = field(default_factory=dict)
+    skill_progress: Counter = field(default_factory=Counter)
+    assessment_results: Optional[Dict[str, Any]] = None
+    skill_levels: Dict[str, str] = field(default_factory=dict)
+    refined_recommendations: List[Dict[str, Any]] = field(default_factory=list)
+    personalized_path: Optional[Dict[str, Any]] = None
+    path_generated_at: Optional[str] = None
+    last_updated: Optional[str] = None
+    
+    def reset_progress(self):
+        """Drop active paths, progress and completion history"""
+        self.active_paths = []
+        self.completed_modules = deque(maxlen=MAX_COMPLETED_MODULES)
+        self.progress = {}
+        self.completed_count = 0
+        self.total_completion_time = 0
+        self.total_score_sum = 0
+        self.completions_by_day = {}
+        self.skill_progress = Counter()
+    
+    def record_completion(self, record: Dict[str, Any]):
+        """Append a completion record and roll it into the aggregates"""
+        self.completed_modules.append(record)
+        self.completed_count += 1
+        self.total_completion_time += record["completion_time"]
+        self.total_score_sum += record["score"]
+        
+        day = _parse_iso_date(record["completed_at"][:10])
+        if day not in self.completions_by_day:
+            cutoff = day - timedelta(days=COMPLETION_DAYS_RETAINED)
+            for old_day in [d for d in self.completions_by_day if d < cutoff]:
+                del self.completions_by_day[old_day]
+        self.completions_by_day[day] = self.completions_by_day.get(day, 0) + 1
+        
+        skill = record.get("skill_tag")
+        if skill:
+            self.skill_progress[skill] += 1
+
 class LearningPathAgent(BaseAgent):
     """
     Learning Path Agent creates and manages personalized learning curricula.
@@ -36,6 +320,18 @@ class LearningPathAgent(BaseAgent):
         self.subscribe_to_event("learning.module_completed")
         self.subscribe_to_event("learning.progress_update")
         
+        # Event type -> handler, resolved with one lookup per event
+        self._dispatch = {
+            "skills.extracted": self._handle_skills_extracted,
+            "assessment.completed": self._handle_assessment_completed,
+            "learning.path_requested": self._handle_learning_path_request,
+            "learning.module_completed": self._handle_module_completion,
+            "learning.progress_update": self._handle_progress_update
+        }
+        
+        # Path ids: per-agent sequence plus a random suffix, unique within the same second
+        self._id_counter = itertools.count(1)
+        
         # Learning curriculum templates
         self.curriculum_templates = {
             "python_fundamentals": {
@@ -151,6 +447,15 @@ class LearningPathAgent(BaseAgent):
             }
         }
         
+        # Freeze templates down to their modules (list fields become tuples);
+        # custom paths layer their changes on top and hand out copies
+        self.curriculum_templates = {
+            curriculum_id: MappingProxyType(dict(template, modules=tuple(
+                _freeze_module(module) for module in template["modules"]
+            )))
+            for curriculum_id, template in self.curriculum_templates.items()
+        }
+        
         # Skill to curriculum mapping
         self.skill_to_curriculum = {
             "python": ["python_fundamentals", "data_structures_algorithms"],
@@ -159,24 +464,74 @@ class LearningPathAgent(BaseAgent):
             "algorithms": ["data_structures_algorithms"],
             "data_structures": ["data_structures_algorithms"]
         }
+        
+        # Static text indexes over the curriculum templates
+        self._curriculum_text: Dict[str, str] = {}
+        self._curriculum_tokens: Dict[str, FrozenSet[str]] = {}
+        for curriculum_id, curriculum in self.curriculum_templates.items():
+            text = (curriculum.get("title", "") + "\n" + curriculum.get("description", "")).lower()
+            self._curriculum_text[curriculum_id] = text
+            self._curriculum_tokens[curriculum_id] = frozenset(_TOKEN_RE.findall(text))
+        
+        # Skill/curriculum graph as an adjacency list. A skill node (category or
+        # text token) points at the curricula it can recommend, in mapping order
+        # first, then curricula whose text mentions it; a curriculum node (keyed
+        # by template id) points at its prerequisite skills.
+        self._kg: Dict[str, List[str]] = defaultdict(list)
+        for category, curriculum_ids in self.skill_to_curriculum.items():
+            self._kg[category].extend(
+                curriculum_id for curriculum_id in curriculum_ids
+                if curriculum_id in self.curriculum_templates
+            )
+        for curriculum_id, tokens in self._curriculum_tokens.items():
+            for token in tokens:
+                if curriculum_id not in self._kg[token]:
+                    self._kg[token].append(curriculum_id)
+        for curriculum_id, curriculum in self.curriculum_templates.items():
+            self._kg[curriculum_id] = list(curriculum.get("prerequisites", ()))
+        self._kg = dict(self._kg)
+        
+        # Per-instance cache so the graph walk is shared by users with the same skill shape
+        self._candidates_for_skills = lru_cache(maxsize=1024)(self._walk_candidates)
+        
+        # Capabilities never change after construction
+        self._capabilities = {
+            "agent_name": "LearningPathAgent",
+            "version": "1.0.0",
+            "capabilities": [
+                "personalized_curriculum_generation",
+                "adaptive_learning_paths",
+                "progress_tracking",
+                "skill_gap_analysis",
+                "resource_curation",
+                "milestone_management"
+            ],
+            "curriculum_templates": list(self.curriculum_templates.keys()),
+            "skill_mappings": self.skill_to_curriculum,
+            "supported_events": [
+                "skills.extracted",
+                "assessment.completed",
+                "learning.path_requested",
+                "learning.module_completed",
+                "learning.progress_update"
+            ],
+            "emitted_events": [
+                "learning.recommendations_ready",
+                "learning.personalized_path_ready",
+                "learning.path_completed",
+                "learning.module_available"
+            ]
+        }
     
     def process_event(self, event: AgentEvent) -> Optional[Dict[str, Any]]:
         """Process learning path related events"""
         try:
-            if event.event_type == "skills.extracted":
-                return self._handle_skills_extracted(event)
-            elif event.event_type == "assessment.completed":
-                return self._handle_assessment_completed(event)
-            elif event.event_type == "learning.path_requested":
-                return self._handle_learning_path_request(event)
-            elif event.event_type == "learning.module_completed":
-                return self._handle_module_completion(event)
-            elif event.event_type == "learning.progress_update":
-                return self._handle_progress_update(event)
-            else:
+            handler = self._dispatch.get(event.event_type)
+            if handler is None:
                 self.logger.warning(f"Unhandled event type: {event.event_type}")
                 return None
-                
+            return handler(event)
+            
         except Exception as e:
             self.logger.error(f"Error processing event {event.event_id}: {str(e)}")
             return {"error": str(e)}
@@ -192,19 +547,16 @@ class LearningPathAgent(BaseAgent):
         # Generate learning path recommendations
         recommendations = self._generate_path_recommendations(extracted_skills, skill_vector)
         
-        # Store learning state
-        learning_state = {
-            "user_id": user_id,
-            "extracted_skills": extracted_skills,
-            "skill_vector": skill_vector,
-            "recommendations": recommendations,
-            "active_paths": [],
-            "completed_modules": [],
-            "progress": {},
-            "created_at": datetime.utcnow().isoformat()
-        }
-        
-        self.update_state(user_id, learning_state)
+        # Store learning state; assessment results from an earlier pass are kept
+        now = _iso_now()
+        learning_state = self.get_state(user_id)
+        if not learning_state:
+            learning_state = self.state[user_id] = LearningState(user_id=user_id, created_at=now)
+        learning_state.extracted_skills = extracted_skills
+        learning_state.skill_vector = skill_vector
+        learning_state.recommendations = recommendations
+        learning_state.reset_progress()
+        learning_state.created_at = now
         
         # Emit recommendations ready event
         self.emit_event(
@@ -237,7 +589,7 @@ class LearningPathAgent(BaseAgent):
         
         # Refine recommendations based on assessment
         refined_recommendations = self._refine_recommendations(
-            learning_state.get("recommendations", []),
+            learning_state.recommendations,
             skill_levels,
             final_results
         )
@@ -245,15 +597,11 @@ class LearningPathAgent(BaseAgent):
         # Generate personalized learning path
         personalized_path = self._generate_personalized_path(skill_levels, final_results)
         
-        learning_state.update({
-            "assessment_results": final_results,
-            "skill_levels": skill_levels,
-            "refined_recommendations": refined_recommendations,
-            "personalized_path": personalized_path,
-            "path_generated_at": datetime.utcnow().isoformat()
-        })
-        
-        self.update_state(user_id, learning_state)
+        learning_state.assessment_results = final_results
+        learning_state.skill_levels = skill_levels
+        learning_state.refined_recommendations = refined_recommendations
+        learning_state.personalized_path = personalized_path
+        learning_state.path_generated_at = _iso_now()
         
         # Emit personalized path ready event
         self.emit_event(
@@ -290,30 +638,26 @@ class LearningPathAgent(BaseAgent):
             requested_path, 
             learning_goals, 
             time_commitment,
-            learning_state.get("skill_levels", {})
+            learning_state.skill_levels
         )
         
         # Add to active paths
-        if "active_paths" not in learning_state:
-            learning_state["active_paths"] = []
-        
-        learning_state["active_paths"].append(custom_path)
-        learning_state["progress"][custom_path["id"]] = {
-            "status": "started",
-            "completed_modules": 0,
-            "total_modules": len(custom_path.get("modules", [])),
-            "start_date": datetime.utcnow().isoformat(),
-            "estimated_completion": self._calculate_completion_date(
+        path_progress = PathProgress(
+            status="started",
+            completed_modules=0,
+            total_modules=custom_path.total_modules,
+            start_date=_iso_now(),
+            estimated_completion=self._calculate_completion_date(
                 custom_path, time_commitment
             )
-        }
-        
-        self.update_state(user_id, learning_state)
+        )
+        learning_state.active_paths.append(custom_path)
+        learning_state.progress[custom_path.id] = path_progress
         
         return {
             "status": "custom_path_created",
-            "path": custom_path,
-            "estimated_completion": learning_state["progress"][custom_path["id"]]["estimated_completion"]
+            "path": custom_path.materialize(),
+            "estimated_completion": path_progress.estimated_completion
         }
     
     def _handle_module_completion(self, event: AgentEvent) -> Dict[str, Any]:
@@ -330,15 +674,17 @@ class LearningPathAgent(BaseAgent):
         if not learning_state:
             return {"error": "Learning state not found"}
         
+        now = _iso_now()
+        
         # Update progress
-        if path_id in learning_state.get("progress", {}):
-            path_progress = learning_state["progress"][path_id]
-            path_progress["completed_modules"] += 1
+        path_progress = learning_state.progress.get(path_id)
+        if path_progress is not None:
+            path_progress.completed_modules += 1
             
             # Check if path is complete
-            if path_progress["completed_modules"] >= path_progress["total_modules"]:
-                path_progress["status"] = "completed"
-                path_progress["completion_date"] = datetime.utcnow().isoformat()
+            if path_progress.completed_modules >= path_progress.total_modules:
+                path_progress.status = "completed"
+                path_progress.completion_date = now
                 
                 # Emit path completion event
                 self.emit_event(
@@ -347,31 +693,27 @@ class LearningPathAgent(BaseAgent):
                     user_id,
                     {
                         "path_id": path_id,
-                        "completion_date": path_progress["completion_date"],
-                        "total_modules": path_progress["total_modules"]
+                        "completion_date": path_progress.completion_date,
+                        "total_modules": path_progress.total_modules
                     }
                 )
         
         # Add to completed modules
-        if "completed_modules" not in learning_state:
-            learning_state["completed_modules"] = []
-        
-        learning_state["completed_modules"].append({
+        learning_state.record_completion({
             "path_id": path_id,
             "module_id": module_id,
-            "completed_at": datetime.utcnow().isoformat(),
+            "completed_at": now,
             "completion_time": completion_time,
-            "score": score
+            "score": score,
+            "skill_tag": _module_skill(module_id)
         })
         
-        self.update_state(user_id, learning_state)
-        
         # Generate next recommendations
-        next_recommendations = self._get_next_recommendations(user_id)
+        next_recommendations = self._get_next_recommendations(user_id, learning_state)
         
         return {
             "status": "module_completed",
-            "path_progress": learning_state["progress"].get(path_id, {}),
+            "path_progress": path_progress.to_dict() if path_progress is not None else {},
             "next_recommendations": next_recommendations
         }
     
@@ -386,13 +728,18 @@ class LearningPathAgent(BaseAgent):
         if not learning_state:
             return {"error": "Learning state not found"}
         
-        # Update progress data
-        for path_id, progress in progress_data.items():
-            if path_id in learning_state.get("progress", {}):
-                learning_state["progress"][path_id].update(progress)
+        # Skip updates that only reference unknown or stale paths
+        progress = learning_state.progress
+        relevant = progress_data.keys() & progress.keys()
+        if not relevant:
+            return {"status": "progress_updated_noop"}
+        
+        # Update progress data; every entry touched by this update shares one timestamp
+        now = _iso_now()
+        for path_id in relevant:
+            progress[path_id].update(progress_data[path_id], last_updated=now)
         
-        learning_state["last_updated"] = datetime.utcnow().isoformat()
-        self.update_state(user_id, learning_state)
+        learning_state.last_updated = now
         
         return {"status": "progress_updated"}
     
@@ -401,37 +748,68 @@ class LearningPathAgent(BaseAgent):
         """Generate initial learning path recommendations"""
         recommendations = []
         
-        # Analyze skill gaps and strengths
-        strong_skills = [skill for skill, level in skill_vector.items() if level > 0.7]
-        weak_skills = [skill for skill, level in skill_vector.items() if level < 0.4]
+        # Analyze skill gaps and strengths (vector keys are "skill_<name>" or a category)
+        strong_skills = {key.removeprefix("skill_") for key, level in skill_vector.items() if level > 0.7}
+        weak_skills = {key.removeprefix("skill_") for key, level in skill_vector.items() if level < 0.4}
         
-        # Recommend paths based on extracted skills
+        # Collect the candidate curricula reachable from the extracted categories;
+        # pace depends only on the skills of the categories that directly reach a curriculum
+        candidates = self._candidates_for_skills(tuple(extracted_skills))
+        strong_hits = set()
+        weak_hits = set()
         for category, skills in extracted_skills.items():
-            if category in self.skill_to_curriculum:
-                for curriculum_id in self.skill_to_curriculum[category]:
-                    if curriculum_id in self.curriculum_templates:
-                        curriculum = self.curriculum_templates[curriculum_id].copy()
-                        
-                        # Customize based on skill level
-                        if any(skill in str(strong_skills).lower() for skill in skills):
-                            curriculum["recommended_pace"] = "accelerated"
-                            curriculum["skip_basics"] = True
-                        elif any(skill in str(weak_skills).lower() for skill in skills):
-                            curriculum["recommended_pace"] = "thorough"
-                            curriculum["extra_practice"] = True
-                        else:
-                            curriculum["recommended_pace"] = "normal"
-                        
-                        curriculum["match_score"] = self._calculate_match_score(
-                            curriculum, extracted_skills, skill_vector
-                        )
-                        
-                        recommendations.append(curriculum)
-        
-        # Sort by match score
-        recommendations.sort(key=lambda x: x.get("match_score", 0), reverse=True)
-        
-        return recommendations[:5]  # Top 5 recommendations
+            curriculum_ids = self._kg.get(category, ())
+            if not strong_skills.isdisjoint(skills):
+                strong_hits.update(curriculum_ids)
+            elif not weak_skills.isdisjoint(skills):
+                weak_hits.update(curriculum_ids)
+        
+        # Score each candidate once
+        for curriculum_id in candidates:
+            curriculum = self.curriculum_templates[curriculum_id].copy()
+            curriculum["modules"] = [dict(module) for module in curriculum["modules"]]
+            
+            # Customize based on skill level
+            if curriculum_id in strong_hits:
+                curriculum["recommended_pace"] = "accelerated"
+                curriculum["skip_basics"] = True
+            elif curriculum_id in weak_hits:
+                curriculum["recommended_pace"] = "thorough"
+                curriculum["extra_practice"] = True
+            else:
+                curriculum["recommended_pace"] = "normal"
+            
+            curriculum["match_score"] = self._calculate_match_score(
+                curriculum_id, extracted_skills, skill_vector
+            )
+            
+            recommendations.append(curriculum)
+        
+        # Top recommendations by match score
+        return heapq.nlargest(MAX_RECOMMENDATIONS, recommendations,
+                              key=lambda x: x.get("match_score", 0))
+    
+    def _next_path_id(self, prefix: str) -> str:
+        """Unique path id for this agent"""
+        return f"{prefix}_{next(self._id_counter):08x}_{secrets.token_hex(3)}"
+    
+    def _walk_candidates(self, skills: Tuple[str, ...]) -> Tuple[str, ...]:
+        """
+        Breadth-first walk from the given skill nodes, returning curricula in
+        discovery order: direct matches first, then curricula that teach their
+        prerequisites, up to CANDIDATE_DEPTH hops.
+        """
+        found: Dict[str, None] = {}
+        frontier = list(skills)
+        for _ in range(CANDIDATE_DEPTH):
+            next_frontier = []
+            for skill in frontier:
+                for curriculum_id in self._kg.get(skill, ()):
+                    if curriculum_id not in found:
+                        found[curriculum_id] = None
+                        next_frontier.extend(self._kg.get(curriculum_id, ()))
+            frontier = next_frontier
+        return tuple(found)
     
     def _refine_recommendations(self, current_recommendations: List[Dict[str, Any]], 
                               skill_levels: Dict[str, str],
@@ -467,10 +845,9 @@ class LearningPathAgent(BaseAgent):
             refined_rec["priority_score"] = priority_score
             refined.append(refined_rec)
         
-        # Sort by priority
-        refined.sort(key=lambda x: x.get("priority_score", 0), reverse=True)
-        
-        return refined
+        # Top recommendations by priority
+        return heapq.nlargest(MAX_RECOMMENDATIONS, refined,
+                              key=lambda x: x.get("priority_score", 0))
     
     def _generate_personalized_path(self, skill_levels: Dict[str, str], 
                                    assessment_results: Dict[str, Any]) -> Dict[str, Any]:
@@ -486,29 +863,20 @@ class LearningPathAgent(BaseAgent):
         else:
             starting_difficulty = "beginner"
         
-        # Create personalized modules based on skill gaps
-        personalized_modules = []
-        
-        # Add foundational modules for low-scoring areas
-        for skill, level in skill_levels.items():
-            if level == "beginner":
-                personalized_modules.extend(self._get_foundational_modules(skill))
-        
-        # Add intermediate modules for moderate areas
-        for skill, level in skill_levels.items():
-            if level == "intermediate":
-                personalized_modules.extend(self._get_intermediate_modules(skill))
+        # Create personalized modules based on skill gaps; the memoized modules
+        # are shared, so this path gets its own copies
+        personalized_modules = [dict(module) for module in _build_personalized_modules(tuple(skill_levels.items()))]
         
         # Create the personalized path
         personalized_path = {
-            "id": f"personalized_{assessment_results.get('user_id', 'user')}_{int(datetime.utcnow().timestamp())}",
+            "id": self._next_path_id(f"personalized_{assessment_results.get('user_id', 'user')}"),
             "title": "Your Personalized Learning Journey",
             "description": f"Customized path based on your assessment results (Score: {avg_score}%)",
             "difficulty": starting_difficulty,
             "total_modules": len(personalized_modules),
             "estimated_weeks": len(personalized_modules) * 2,  # 2 weeks per module average
             "modules": personalized_modules,
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": _iso_now(),
             "assessment_based": True,
             "skill_focus": list(skill_levels.keys())
         }
@@ -516,156 +884,110 @@ class LearningPathAgent(BaseAgent):
         return personalized_path
     
     def _create_custom_path(self, path_type: str, learning_goals: List[str], 
-                          time_commitment: int, skill_levels: Dict[str, str]) -> Dict[str, Any]:
+                          time_commitment: int, skill_levels: Dict[str, str]) -> CustomizedPath:
         """Create custom learning path based on user preferences"""
         
-        # Select base curriculum
-        base_curriculum = None
+        # Select base curriculum (shared, never copied)
         if path_type in self.curriculum_templates:
-            base_curriculum = self.curriculum_templates[path_type].copy()
+            base_curriculum = self.curriculum_templates[path_type]
         else:
             # Default to most relevant curriculum
-            base_curriculum = list(self.curriculum_templates.values())[0].copy()
+            base_curriculum = next(iter(self.curriculum_templates.values()))
+        
+        custom_path = CustomizedPath(
+            id=self._next_path_id(f"custom_{path_type}"),
+            template=base_curriculum,
+            time_commitment=time_commitment,
+            learning_goals=learning_goals,
+            created_at=_iso_now()
+        )
         
         # Customize based on time commitment
-        modules = base_curriculum.get("modules", [])
         if time_commitment < 5:  # Less than 5 hours per week
             # Extend timeline and add more practice
-            for module in modules:
-                module["duration_hours"] = int(module.get("duration_hours", 5) * 1.5)
-                module["extra_practice"] = True
+            custom_path.duration_factor = 1.5
+            custom_path.module_overrides = {"extra_practice": True}
         elif time_commitment > 10:  # More than 10 hours per week
             # Accelerated pace
-            for module in modules:
-                module["duration_hours"] = int(module.get("duration_hours", 5) * 0.8)
-                module["accelerated"] = True
+            custom_path.duration_factor = 0.8
+            custom_path.module_overrides = {"accelerated": True}
         
         # Add goal-specific modules
-        for goal in learning_goals:
-            if goal.lower() in ["job interview", "interview prep"]:
-                modules.append({
-                    "title": "Technical Interview Preparation",
-                    "description": "Practice coding interviews and system design",
-                    "duration_hours": 15,
-                    "topics": ["interview_practice", "system_design", "behavioral_questions"],
-                    "exercises": 20
-                })
+        custom_path.extra_modules.extend(
+            _INTERVIEW_PREP_MODULE for goal in learning_goals
+            if goal.lower() in _INTERVIEW_GOALS
+        )
         
-        custom_path = {
-            "id": f"custom_{path_type}_{int(datetime.utcnow().timestamp())}",
-            "title": base_curriculum.get("title", "Custom Learning Path"),
-            "description": base_curriculum.get("description", ""),
-            "modules": modules,
-            "time_commitment": time_commitment,
-            "learning_goals": learning_goals,
-            "customized": True,
-            "created_at": datetime.utcnow().isoformat()
-        }
+        # Modules are final from here on
+        custom_path.total_hours = custom_path.sum_hours()
         
         return custom_path
     
     def _get_foundational_modules(self, skill: str) -> List[Dict[str, Any]]:
         """Get foundational modules for a skill area"""
-        foundational_modules = {
-            "python": [
-                {
-                    "title": "Python Basics Review",
-                    "description": "Strengthen Python fundamentals",
-                    "duration_hours": 8,
-                    "topics": ["syntax", "variables", "basic_operations"],
-                    "exercises": 10
-                }
-            ],
-            "javascript": [
-                {
-                    "title": "JavaScript Fundamentals",
-                    "description": "Core JavaScript concepts and syntax",
-                    "duration_hours": 10,
-                    "topics": ["variables", "functions", "objects", "arrays"],
-                    "exercises": 12
-                }
-            ]
-        }
-        
-        return foundational_modules.get(skill, [])
+        return [dict(module) for module in _FOUNDATIONAL_MODULES.get(skill, ())]
     
     def _get_intermediate_modules(self, skill: str) -> List[Dict[str, Any]]:
         """Get intermediate modules for a skill area"""
-        intermediate_modules = {
-            "python": [
-                {
-                    "title": "Advanced Python Concepts",
-                    "description": "Object-oriented programming and advanced features",
-                    "duration_hours": 12,
-                    "topics": ["oop", "decorators", "generators", "context_managers"],
-                    "exercises": 15
-                }
-            ],
-            "javascript": [
-                {
-                    "title": "Modern JavaScript",
-                    "description": "ES6+ features and async programming",
-                    "duration_hours": 15,
-                    "topics": ["arrow_functions", "promises", "async_await", "modules"],
-                    "exercises": 18
-                }
-            ]
-        }
-        
-        return intermediate_modules.get(skill, [])
+        return [dict(module) for module in _INTERMEDIATE_MODULES.get(skill, ())]
     
-    def _calculate_match_score(self, curriculum: Dict[str, Any], 
+    def _mentions(self, curriculum_id: str, term: str) -> bool:
+        """
+        Check whether a curriculum's title or description mentions term.
+        Single words are matched against the precomputed token set; phrases
+        and terms with punctuation (e.g. "node.js") against the lowered text.
+        """
+        if term in self._curriculum_tokens[curriculum_id]:
+            return True
+        return not _TOKEN_RE.fullmatch(term) and term in self._curriculum_text[curriculum_id]
+    
+    def _calculate_match_score(self, curriculum_id: str, 
                              extracted_skills: Dict[str, List[str]], 
                              skill_vector: Dict[str, float]) -> float:
         """Calculate how well a curriculum matches user's skills"""
         match_score = 0.0
         
-        curriculum_title = curriculum.get("title", "").lower()
-        curriculum_description = curriculum.get("description", "").lower()
-        
         # Check skill category matches
         for category, skills in extracted_skills.items():
-            if category.replace("_", " ") in curriculum_title or category.replace("_", " ") in curriculum_description:
+            if self._mentions(curriculum_id, category.replace("_", " ")):
                 match_score += 0.3
             
             # Check individual skill matches
             for skill in skills:
-                if skill in curriculum_title or skill in curriculum_description:
+                if self._mentions(curriculum_id, skill):
                     skill_level = skill_vector.get(f"skill_{skill}", 0.5)
                     match_score += skill_level * 0.1
         
         return min(match_score, 1.0)
     
-    def _calculate_completion_date(self, path: Dict[str, Any], hours_per_week: int) -> str:
+    def _calculate_completion_date(self, path: CustomizedPath, hours_per_week: int) -> str:
         """Calculate estimated completion date for a learning path"""
-        total_hours = sum(module.get("duration_hours", 5) for module in path.get("modules", []))
+        total_hours = path.total_hours or path.sum_hours()
         weeks_needed = total_hours / max(hours_per_week, 1)
         completion_date = datetime.utcnow() + timedelta(weeks=weeks_needed)
         return completion_date.isoformat()
     
-    def _get_next_recommendations(self, user_id: str) -> List[Dict[str, Any]]:
+    def _get_next_recommendations(self, user_id: str,
+                                  learning_state: Optional[LearningState] = None) -> List[Dict[str, Any]]:
         """Get next learning recommendations based on current progress"""
-        learning_state = self.get_state(user_id)
+        if learning_state is None:
+            learning_state = self.get_state(user_id)
         if not learning_state:
             return []
         
-        completed_modules = learning_state.get("completed_modules", [])
-        active_paths = learning_state.get("active_paths", [])
-        
         recommendations = []
         
         # Recommend next modules in active paths
-        for path in active_paths:
-            path_progress = learning_state.get("progress", {}).get(path["id"], {})
-            completed_count = path_progress.get("completed_modules", 0)
-            total_modules = len(path.get("modules", []))
+        for path in learning_state.active_paths:
+            path_progress = learning_state.progress.get(path.id)
+            completed_count = path_progress.completed_modules if path_progress else 0
             
-            if completed_count < total_modules:
-                next_module = path["modules"][completed_count]
+            if completed_count < path.total_modules:
+                next_module = path.module_at(completed_count)
                 recommendations.append({
                     "type": "continue_path",
-                    "path_id": path["id"],
-                    "path_title": path.get("title", ""),
+                    "path_id": path.id,
+                    "path_title": path.template.get("title", ""),
                     "next_module": next_module,
                     "priority": "high"
                 })
@@ -680,11 +1002,11 @@ class LearningPathAgent(BaseAgent):
         
         dashboard = {
             "user_id": user_id,
-            "active_paths": learning_state.get("active_paths", []),
-            "progress": learning_state.get("progress", {}),
-            "completed_modules": len(learning_state.get("completed_modules", [])),
-            "recommendations": learning_state.get("recommendations", []),
-            "next_actions": self._get_next_recommendations(user_id),
+            "active_paths": [path.materialize() for path in learning_state.active_paths],
+            "progress": {path_id: progress.to_dict() for path_id, progress in learning_state.progress.items()},
+            "completed_modules": learning_state.completed_count,
+            "recommendations": learning_state.recommendations,
+            "next_actions": self._get_next_recommendations(user_id, learning_state),
             "learning_streak": self._calculate_learning_streak(learning_state),
             "total_study_time": self._calculate_total_study_time(learning_state),
             "skill_progress": self._calculate_skill_progress(learning_state),
@@ -693,99 +1015,55 @@ class LearningPathAgent(BaseAgent):
         
         return dashboard
     
-    def _calculate_learning_streak(self, learning_state: Dict[str, Any]) -> int:
+    def _calculate_learning_streak(self, learning_state: LearningState) -> int:
         """Calculate current learning streak"""
-        completed_modules = learning_state.get("completed_modules", [])
-        if not completed_modules:
+        completions_by_day = learning_state.completions_by_day
+        current_date = datetime.utcnow().date()
+        
+        # No activity today means no running streak; skips the walk for inactive users
+        if current_date not in completions_by_day:
             return 0
         
-        # Simple streak calculation based on daily activity
+        # Simple streak calculation based on daily activity, over the last 30 days
         streak = 0
-        current_date = datetime.utcnow().date()
-        
-        for i in range(30):  # Check last 30 days
-            check_date = current_date - timedelta(days=i)
-            day_activity = any(
-                datetime.fromisoformat(module["completed_at"]).date() == check_date
-                for module in completed_modules
-            )
-            
-            if day_activity:
-                streak += 1
-            else:
-                break
+        one_day = timedelta(days=1)
+        while streak < 30 and current_date in completions_by_day:
+            streak += 1
+            current_date -= one_day
         
         return streak
     
-    def _calculate_total_study_time(self, learning_state: Dict[str, Any]) -> int:
+    def _calculate_total_study_time(self, learning_state: LearningState) -> int:
         """Calculate total study time in hours"""
-        completed_modules = learning_state.get("completed_modules", [])
-        total_time = sum(module.get("completion_time", 2) for module in completed_modules)
-        return total_time
+        return learning_state.total_completion_time
     
-    def _calculate_skill_progress(self, learning_state: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_skill_progress(self, learning_state: LearningState) -> Dict[str, Any]:
         """Calculate skill progress based on completed modules"""
-        completed_modules = learning_state.get("completed_modules", [])
-        skill_progress = {}
-        
-        # This would be more sophisticated in practice
-        for module in completed_modules:
-            # Extract skills from module topics (simplified)
-            module_id = module.get("module_id", "")
-            if "python" in module_id.lower():
-                skill_progress["python"] = skill_progress.get("python", 0) + 1
-            elif "javascript" in module_id.lower():
-                skill_progress["javascript"] = skill_progress.get("javascript", 0) + 1
-        
-        return skill_progress
+        # Counted per completion in LearningState.record_completion
+        return dict(learning_state.skill_progress)
     
-    def _get_learning_achievements(self, learning_state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _get_learning_achievements(self, learning_state: LearningState) -> List[Dict[str, Any]]:
         """Get learning-specific achievements"""
         achievements = []
-        completed_modules = learning_state.get("completed_modules", [])
+        completed_count = learning_state.completed_count
+        now = _iso_now()
         
-        if len(completed_modules) >= 5:
+        if completed_count >= 5:
             achievements.append({
                 "title": "Dedicated Learner",
                 "description": "Completed 5 learning modules",
-                "earned_at": datetime.utcnow().isoformat()
+                "earned_at": now
             })
         
-        if len(completed_modules) >= 20:
+        if completed_count >= 20:
             achievements.append({
                 "title": "Learning Marathon",
                 "description": "Completed 20 learning modules", 
-                "earned_at": datetime.utcnow().isoformat()
+                "earned_at": now
             })
         
         return achievements
     
     def get_capabilities(self) -> Dict[str, Any]:
         """Return agent capabilities"""
-        return {
-            "agent_name": "LearningPathAgent",
-            "version": "1.0.0",
-            "capabilities": [
-                "personalized_curriculum_generation",
-                "adaptive_learning_paths",
-                "progress_tracking",
-                "skill_gap_analysis",
-                "resource_curation",
-                "milestone_management"
-            ],
-            "curriculum_templates": list(self.curriculum_templates.keys()),
-            "skill_mappings": self.skill_to_curriculum,
-            "supported_events": [
-                "skills.extracted",
-                "assessment.completed",
-                "learning.path_requested",
-                "learning.module_completed",
-                "learning.progress_update"
-            ],
-            "emitted_events": [
-                "learning.recommendations_ready",
-                "learning.personalized_path_ready",
-                "learning.path_completed",
-                "learning.module_available"
-            ]
-        }
\ No newline at end of file
+        return self._capabilities
\ No newline at end of file
@@ -6,16 +6,50 @@ Manages user profiles, skill analysis, and resume processing.
 Uses AI/NLP to extract technical skills and generate skill vectors.
 """
 
+import hashlib
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import re
 
 from .base_agent import BaseAgent, AgentEvent
 
+try:
+    import hyperscan
+except ImportError:  # hyperscan is optional; falls back to Aho-Corasick or regexes
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; falls back to per-category regexes
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+def _collect_hs_match(pattern_id: int, start: int, end: int, flags: int, context: set):
+    """Hyperscan match callback: record the matched keyword's pattern id"""
+    context.add(pattern_id)
+
+# Strength parameters for categories without a configured weight or keyword list
+_DEFAULT_CATEGORY_SCALE = (0.5, 10)
+
+def _is_word_boundary(text: str, index: int) -> bool:
+    """Same test as regex \\b at index: word-ness differs on either side"""
+    before = index > 0 and (text[index - 1].isalnum() or text[index - 1] == "_")
+    after = index < len(text) and (text[index].isalnum() or text[index] == "_")
+    return before != after
+
+# Additional NLP-based extraction (simplified version), one pass over the raw text
+_TECH_PATTERN = re.compile(
+    r'\b\w+\.js\b'         # JavaScript frameworks/libraries
+    r'|\bAPI\b'             # API mentions
+    r'|\bRESTful?\b'        # REST API
+    r'|\bGraphQL\b'         # GraphQL
+    r'|\bMicroservices?\b', # Microservices
+    re.IGNORECASE
+)
+
 class ProfileAgent(BaseAgent):
     """
     Profile Agent handles user registration, skill extraction, and profile management.
@@ -71,6 +105,101 @@ class ProfileAgent(BaseAgent):
                 ".net", "laravel", "rails", "symfony", "fastapi"
             ]
         }
+        
+        # Keyword sets for O(1) membership checks by category
+        self.skill_categories_set = {
+            category: frozenset(keywords) for category, keywords in self.skill_categories.items()
+        }
+        
+        # Weight different categories
+        self._category_weights = {
+            "programming_languages": 1.0,
+            "web_technologies": 0.8,
+            "databases": 0.7,
+            "cloud_platforms": 0.9,
+            "data_science": 0.9,
+            "mobile_development": 0.8,
+            "devops_tools": 0.7,
+            "frameworks": 0.6,
+            "additional_technologies": 0.5
+        }
+        
+        # Skill vector constants: keywords per category and "skill_<name>" keys
+        self._category_max = {category: len(keywords) for category, keywords in self.skill_categories.items()}
+        # Category strength parameters, resolved once: (weight, skill count at full strength)
+        self._category_scales: Dict[str, Tuple[float, int]] = {
+            category: (self._category_weights.get(category, _DEFAULT_CATEGORY_SCALE[0]),
+                       self._category_max.get(category) or _DEFAULT_CATEGORY_SCALE[1])
+            for category in self._category_weights.keys() | self._category_max.keys()
+        }
+        self._skill_key_cache = {
+            skill: f"skill_{skill}"
+            for keywords in self.skill_categories.values()
+            for skill in keywords
+        }
+        
+        # One alternation per category, longest keywords first so phrases win
+        self._category_patterns = {
+            category: re.compile(
+                r'\b(?:' + '|'.join(re.escape(skill) for skill in sorted(keywords, key=len, reverse=True)) + r')\b',
+                re.IGNORECASE
+            )
+            for category, keywords in self.skill_categories.items()
+        }
+        
+        # Every keyword with all categories listing it, for single-pass matchers
+        keyword_categories: Dict[str, List[str]] = {}
+        for category, keywords in self.skill_categories.items():
+            for skill in keywords:
+                keyword_categories.setdefault(skill, []).append(category)
+        
+        # With hyperscan, one compiled database matches every word-bounded
+        # keyword in a single scan; pattern ids index self._hs_keywords
+        self._hs_db = None
+        self._hs_keywords = [(skill, tuple(categories)) for skill, categories in keyword_categories.items()]
+        if hyperscan is not None:
+            self._hs_db = hyperscan.Database()
+            self._hs_db.compile(
+                expressions=[(r'\b' + re.escape(skill) + r'\b').encode() for skill, _ in self._hs_keywords],
+                ids=list(range(len(self._hs_keywords))),
+                elements=len(self._hs_keywords),
+                flags=hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8
+            )
+        
+        # Otherwise with pyahocorasick, a single automaton finds every keyword
+        # in one pass and word boundaries are checked around each hit
+        self._automaton = None
+        if self._hs_db is None and ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for skill, categories in keyword_categories.items():
+                self._automaton.add_word(skill, (skill, tuple(categories)))
+            self._automaton.make_automaton()
+        
+        # Capabilities never change after construction
+        self._capabilities = {
+            "agent_name": "ProfileAgent",
+            "version": "1.0.0",
+            "capabilities": [
+                "skill_extraction",
+                "resume_analysis", 
+                "profile_management",
+                "skill_vector_generation",
+                "gap_analysis"
+            ],
+            "supported_events": [
+                "user.registered",
+                "resume.uploaded", 
+                "profile.update_requested",
+                "skills.assessment_completed"
+            ],
+            "emitted_events": [
+                "profile.created",
+                "skills.extracted",
+                "skills.refined"
+            ],
+            "skill_categories": list(self.skill_categories.keys()),
+            "total_skill_keywords": sum(len(keywords) for keywords in self.skill_categories.values())
+        }
     
     def process_event(self, event: AgentEvent) -> Optional[Dict[str, Any]]:
         """Process incoming events related to user profiles"""
@@ -93,6 +222,7 @@ class ProfileAgent(BaseAgent):
     
     def _handle_user_registration(self, event: AgentEvent) -> Dict[str, Any]:
         """Handle new user registration"""
+        now_iso = datetime.utcnow().isoformat()
         user_id = event.user_id
         payload = event.payload
         
@@ -100,11 +230,11 @@ class ProfileAgent(BaseAgent):
         profile_data = {
             "user_id": user_id,
             "username": payload.get("username", ""),
-            "registration_date": datetime.utcnow().isoformat(),
+            "registration_date": now_iso,
             "profile_completeness": 20,  # Basic registration complete
             "extracted_skills": {},
             "skill_vector": {},
-            "last_updated": datetime.utcnow().isoformat()
+            "last_updated": now_iso
         }
         
         self.update_state(user_id, profile_data)
@@ -125,6 +255,7 @@ class ProfileAgent(BaseAgent):
     
     def _handle_resume_upload(self, event: AgentEvent) -> Dict[str, Any]:
         """Handle resume upload and process for skill extraction"""
+        now_iso = datetime.utcnow().isoformat()
         user_id = event.user_id
         payload = event.payload
         resume_text = payload.get("resume_text", "")
@@ -132,18 +263,36 @@ class ProfileAgent(BaseAgent):
         if not resume_text:
             return {"error": "No resume text provided"}
         
+        return self._process_resume(user_id, resume_text, now_iso)
+    
+    def _process_resume(self, user_id: str, resume_text: str, now_iso: str,
+                        other_updates: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Extract skills from resume text, store them together with any other
+        profile field updates in a single state write, and announce them.
+        Re-uploads of an unchanged resume reuse the stored extraction.
+        """
+        resume_hash = hashlib.blake2b(resume_text.encode(), digest_size=8).hexdigest()
+        prior = self.get_state(user_id)
+        
         # Extract skills from resume text
-        extracted_skills = self._extract_skills_from_text(resume_text)
+        if prior.get("resume_hash") == resume_hash and prior.get("extracted_skills"):
+            extracted_skills = prior["extracted_skills"]
+        else:
+            extracted_skills = self._extract_skills_from_text(resume_text)
         skill_vector = self._generate_skill_vector(extracted_skills)
+        total_skills = sum(len(skills) for skills in extracted_skills.values())
         
         # Update user state
         profile_update = {
+            **(other_updates or {}),
             "resume_text": resume_text,
+            "resume_hash": resume_hash,
             "extracted_skills": extracted_skills,
             "skill_vector": skill_vector,
             "profile_completeness": self._calculate_completeness(extracted_skills),
-            "last_updated": datetime.utcnow().isoformat(),
-            "skills_extraction_date": datetime.utcnow().isoformat()
+            "last_updated": now_iso,
+            "skills_extraction_date": now_iso
         }
         
         self.update_state(user_id, profile_update)
@@ -157,19 +306,20 @@ class ProfileAgent(BaseAgent):
                 "extracted_skills": extracted_skills,
                 "skill_vector": skill_vector,
                 "skill_categories": list(extracted_skills.keys()),
-                "total_skills": sum(len(skills) for skills in extracted_skills.values())
+                "total_skills": total_skills
             }
         )
         
         return {
             "status": "skills_extracted",
             "extracted_skills": extracted_skills,
-            "skill_count": sum(len(skills) for skills in extracted_skills.values()),
+            "skill_count": total_skills,
             "completeness": profile_update["profile_completeness"]
         }
     
     def _handle_profile_update(self, event: AgentEvent) -> Dict[str, Any]:
         """Handle profile update requests"""
+        now_iso = datetime.utcnow().isoformat()
         user_id = event.user_id
         payload = event.payload
         
@@ -178,29 +328,23 @@ class ProfileAgent(BaseAgent):
         if not current_state:
             return {"error": "User profile not found"}
         
-        # Update fields
         updates = payload.get("updates", {})
-        current_state.update(updates)
-        current_state["last_updated"] = datetime.utcnow().isoformat()
         
-        self.update_state(user_id, current_state)
+        # If resume text was updated, re-extract skills and store everything in one write
+        if updates.get("resume_text"):
+            return self._process_resume(user_id, updates["resume_text"], now_iso, updates)
+        
+        # Update fields
+        self.update_state(user_id, {**updates, "last_updated": now_iso})
         
-        # If resume text was updated, re-extract skills
         if "resume_text" in updates:
-            return self._handle_resume_upload(AgentEvent(
-                event_type="resume.uploaded",
-                source_agent="ProfileAgent",
-                target_agent=None,
-                user_id=user_id,
-                payload={"resume_text": updates["resume_text"]},
-                timestamp=datetime.utcnow(),
-                event_id=f"profile_update_{user_id}"
-            ))
+            return {"error": "No resume text provided"}
         
         return {"status": "profile_updated", "updates": list(updates.keys())}
     
     def _handle_skills_assessment(self, event: AgentEvent) -> Dict[str, Any]:
         """Handle completed skills assessment to refine skill vector"""
+        now_iso = datetime.utcnow().isoformat()
         user_id = event.user_id
         payload = event.payload
         
@@ -219,8 +363,8 @@ class ProfileAgent(BaseAgent):
         # Update state
         profile_update = {
             "skill_vector": refined_vector,
-            "assessment_date": datetime.utcnow().isoformat(),
-            "last_updated": datetime.utcnow().isoformat(),
+            "assessment_date": now_iso,
+            "last_updated": now_iso,
             "profile_completeness": 100  # Assessment complete
         }
         
@@ -242,75 +386,63 @@ class ProfileAgent(BaseAgent):
     
     def _extract_skills_from_text(self, text: str) -> Dict[str, List[str]]:
         """Extract technical skills from resume text using NLP and keyword matching"""
-        text_lower = text.lower()
         extracted_skills = {}
         
+        if self._hs_db is not None:
+            matched_ids = set()
+            self._hs_db.scan(text.encode(), match_event_handler=_collect_hs_match, context=matched_ids)
+            found_by_category: Dict[str, set] = {}
+            for pattern_id in matched_ids:
+                skill, categories = self._hs_keywords[pattern_id]
+                for category in categories:
+                    found_by_category.setdefault(category, set()).add(skill)
+        elif self._automaton is not None:
+            text_lower = text.lower()
+            found_by_category: Dict[str, set] = {}
+            for end, (skill, categories) in self._automaton.iter(text_lower):
+                start = end - len(skill) + 1
+                if _is_word_boundary(text_lower, start) and _is_word_boundary(text_lower, end + 1):
+                    for category in categories:
+                        found_by_category.setdefault(category, set()).add(skill)
+        else:
+            found_by_category = {
+                category: {match.lower() for match in pattern.findall(text)}
+                for category, pattern in self._category_patterns.items()
+            }
+        
         for category, keywords in self.skill_categories.items():
-            found_skills = []
-            
-            for skill in keywords:
-                # Use regex for better matching
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_skills.append(skill)
+            found = found_by_category.get(category)
             
-            if found_skills:
-                extracted_skills[category] = found_skills
+            if found:
+                # Keep the category's keyword order
+                extracted_skills[category] = [skill for skill in keywords if skill in found]
         
-        # Additional NLP-based extraction (simplified version)
         # In production, this would use more sophisticated NLP models
-        tech_patterns = [
-            r'\b\w+\.js\b',  # JavaScript frameworks/libraries
-            r'\bAPI\b',       # API mentions
-            r'\bRESTful?\b',  # REST API
-            r'\bGraphQL\b',   # GraphQL
-            r'\bMicroservices?\b'  # Microservices
-        ]
-        
-        additional_skills = []
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            additional_skills.extend([match.lower() for match in matches])
+        additional_skills = {match.lower() for match in _TECH_PATTERN.findall(text)}
         
         if additional_skills:
-            extracted_skills["additional_technologies"] = list(set(additional_skills))
+            extracted_skills["additional_technologies"] = list(additional_skills)
         
         return extracted_skills
     
     def _generate_skill_vector(self, extracted_skills: Dict[str, List[str]]) -> Dict[str, float]:
         """Generate numerical skill vector for ML processing"""
         skill_vector = {}
-        
-        # Weight different categories
-        category_weights = {
-            "programming_languages": 1.0,
-            "web_technologies": 0.8,
-            "databases": 0.7,
-            "cloud_platforms": 0.9,
-            "data_science": 0.9,
-            "mobile_development": 0.8,
-            "devops_tools": 0.7,
-            "frameworks": 0.6,
-            "additional_technologies": 0.5
-        }
+        skill_keys = self._skill_key_cache
+        scales = self._category_scales
         
         for category, skills in extracted_skills.items():
-            weight = category_weights.get(category, 0.5)
+            weight, full_count = scales.get(category, _DEFAULT_CATEGORY_SCALE)
             
             # Calculate category strength based on number of skills
-            skill_count = len(skills)
-            max_skills_in_category = len(self.skill_categories.get(category, []))
-            
-            if max_skills_in_category > 0:
-                category_strength = min(skill_count / max_skills_in_category, 1.0) * weight
-            else:
-                category_strength = min(skill_count / 10, 1.0) * weight  # Fallback
+            category_strength = min(len(skills) / full_count, 1.0) * weight
             
             skill_vector[category] = round(category_strength, 3)
             
             # Add individual skill weights
-            for skill in skills:
-                skill_vector[f"skill_{skill}"] = weight
+            skill_vector.update(dict.fromkeys(
+                (skill_keys.get(skill) or f"skill_{skill}" for skill in skills), weight
+            ))
         
         return skill_vector
     
@@ -321,27 +453,45 @@ class ProfileAgent(BaseAgent):
         # Add points for different skill categories
         category_points = min(len(extracted_skills) * 10, 50)  # Max 50 points
         
-        # Add points for skill diversity
-        total_skills = sum(len(skills) for skills in extracted_skills.values())
+        # Add points for skill diversity; when these alone can reach 100,
+        # stop counting as soon as they do
+        missing_points = 100 - base_score - category_points
+        can_saturate = missing_points <= 20
+        total_skills = 0
+        for skills in extracted_skills.values():
+            total_skills += len(skills)
+            if can_saturate and total_skills * 2 >= missing_points:
+                return 100
         skill_points = min(total_skills * 2, 20)  # Max 20 points
         
         return min(base_score + category_points + skill_points, 100)
     
     def _refine_skill_vector(self, current_vector: Dict[str, float], 
                            assessment_results: Dict[str, Any]) -> Dict[str, float]:
-        """Refine skill vector based on assessment performance"""
-        refined_vector = current_vector.copy()
+        """
+        Refine skill vector based on assessment performance. The vector is
+        copied only once a level actually changes; otherwise it is returned as is.
+        """
+        refined_vector = current_vector
         
-        # Adjust skills based on assessment scores
+        # Adjust skills based on assessment scores; mid-range scores leave the level as is
         for skill_area, score in assessment_results.items():
+            if 0.6 <= score < 0.8:
+                continue
+            
+            skill_area = skill_area.lower()
+            skill_key = self._skill_key_cache.get(skill_area) or f"skill_{skill_area}"
+            level = refined_vector.get(skill_key)
+            if level is None:
+                continue
+            
+            if refined_vector is current_vector:
+                refined_vector = current_vector.copy()
+            
             if score >= 0.8:  # High performance
-                skill_key = f"skill_{skill_area.lower()}"
-                if skill_key in refined_vector:
-                    refined_vector[skill_key] = min(refined_vector[skill_key] * 1.2, 1.0)
-            elif score < 0.6:  # Low performance
-                skill_key = f"skill_{skill_area.lower()}"
-                if skill_key in refined_vector:
-                    refined_vector[skill_key] = refined_vector[skill_key] * 0.8
+                refined_vector[skill_key] = min(level * 1.2, 1.0)
+            else:  # Low performance
+                refined_vector[skill_key] = level * 0.8
         
         return refined_vector
     
@@ -377,27 +527,4 @@ class ProfileAgent(BaseAgent):
     
     def get_capabilities(self) -> Dict[str, Any]:
         """Return agent capabilities"""
-        return {
-            "agent_name": "ProfileAgent",
-            "version": "1.0.0",
-            "capabilities": [
-                "skill_extraction",
-                "resume_analysis", 
-                "profile_management",
-                "skill_vector_generation",
-                "gap_analysis"
-            ],
-            "supported_events": [
-                "user.registered",
-                "resume.uploaded", 
-                "profile.update_requested",
-                "skills.assessment_completed"
-            ],
-            "emitted_events": [
-                "profile.created",
-                "skills.extracted",
-                "skills.refined"
-            ],
-            "skill_categories": list(self.skill_categories.keys()),
-            "total_skill_keywords": sum(len(keywords) for keywords in self.skill_categories.values())
-        }
\ No newline at end of file
+        return self._capabilities
\ No newline at end of file
@@ -1,234 +1,495 @@
+import hashlib
 import json
 import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
 import requests
-from typing import Dict, List, Any
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
 import logging
 
+from json_codec import dumps as _dumps, loads as _loads
+
+# Caps concurrent in-flight requests against OpenRouter across all generators
+MAX_CONCURRENT_LLM_CALLS = 5
+_llm_slots = threading.BoundedSemaphore(MAX_CONCURRENT_LLM_CALLS)
+
+# OpenRouter's free-tier request budget, enforced before each call
+LLM_REQUESTS_PER_MINUTE = 20
+# Longest a request waits for budget before giving up and using the fallback,
+# so a burst of users cannot tie up every web worker thread
+LLM_RATE_LIMIT_MAX_WAIT = 5.0
+
+class _RateLimiter:
+    """Thread-safe token bucket shared by every generator instance"""
+    
+    def __init__(self, per_minute: int, burst: int):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a request token; True once one is taken. Returns False right
+        away if none will be available within timeout seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+_rate_limiter = _RateLimiter(LLM_REQUESTS_PER_MINUTE, burst=MAX_CONCURRENT_LLM_CALLS)
+
+# Connection errors and throttling/5xx replies are retried with jittered backoff;
+# timeouts are not, since another 30s wait would outlast the web worker
+LLM_MAX_ATTEMPTS = 3
+LLM_RETRY_BASE_DELAY = 0.5
+LLM_RETRY_MAX_DELAY = 4.0
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before the next attempt, honouring a numeric Retry-After"""
+    if retry_after:
+        try:
+            return min(float(retry_after), LLM_RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+    delay = min(LLM_RETRY_BASE_DELAY * 2 ** (attempt - 1), LLM_RETRY_MAX_DELAY)
+    return random.uniform(delay / 2, delay)
+
+# Cache keys of requests currently in flight, so duplicates wait instead of re-sending
+_inflight: Dict[str, threading.Event] = {}
+_inflight_lock = threading.Lock()
+
+# One pooled keep-alive session shared by every generator instance, since
+# callers create a fresh CourseGenerator per request
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def _get_session() -> requests.Session:
+    """Return the shared HTTP session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update({"Content-Type": "application/json"})
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENT_LLM_CALLS)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+# Parsed responses are cached by a hash of (model, prompt) for an hour
+RESPONSE_CACHE_TTL = 3600
+# Plans depend only on the skill profile, so they stay valid for a week
+PLAN_CACHE_TTL = 7 * 24 * 3600
+RESPONSE_CACHE_SIZE = 256
+_response_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+def _cache_get(key: str) -> Optional[str]:
+    """Return the cached raw response for key, or None if missing or expired"""
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+        return entry[1]
+
+def _cache_put(key: str, content: str, ttl: int = RESPONSE_CACHE_TTL):
+    """Store a raw response, evicting the least recently used entries"""
+    with _response_cache_lock:
+        _response_cache[key] = (time.monotonic() + ttl, content)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+# Example responses shown to the model; rendered once, compactly, into the system prompts
+_ANALYSIS_EXAMPLE = {
+    "extracted_skills": [
+        {
+            "skill": "Python",
+            "proficiency": "intermediate",
+            "evidence": "3 years experience, built web apps",
+            "category": "programming"
+        }
+    ],
+    "skill_gaps": [
+        "Advanced algorithms",
+        "System design",
+        "Cloud platforms"
+    ],
+    "career_level": "mid-level",
+    "focus_areas": ["backend", "data science", "web development"]
+}
+
+_ANALYZE_SYSTEM_PROMPT = (
+    "Analyze the resume provided by the user and extract technical skills with proficiency levels and learning recommendations.\n\n"
+    "Return JSON with this structure:\n"
+    + json.dumps(_ANALYSIS_EXAMPLE, separators=(",", ":"))
+)
+
+_PLAN_EXAMPLE = {
+    "learning_path": {
+        "title": "Personalized Development Path",
+        "duration": "12 weeks",
+        "difficulty": "intermediate"
+    },
+    "courses": [
+        {
+            "id": "course_1",
+            "title": "Advanced Python Programming",
+            "description": "Master advanced Python concepts",
+            "duration": "4 weeks",
+            "difficulty": "intermediate",
+            "modules": [
+                {
+                    "title": "Object-Oriented Programming",
+                    "duration": "1 week",
+                    "resources": [
+                        {"type": "video", "title": "OOP Fundamentals", "url": "https://www.youtube.com/watch?v=example"},
+                        {"type": "article", "title": "Python Classes Guide", "url": "https://realpython.com/python3-object-oriented-programming/"}
+                    ],
+                    "exercises": [
+                        "Create a class hierarchy for a library system",
+                        "Implement inheritance and polymorphism"
+                    ]
+                }
+            ],
+            "skills_covered": ["object-oriented programming", "design patterns"],
+            "prerequisites": ["basic python"],
+            "outcome": "Build complex applications using OOP principles"
+        }
+    ],
+    "projects": [
+        {
+            "title": "Portfolio Website with Python Backend",
+            "description": "Build a full-stack application",
+            "skills_applied": ["python", "web development", "databases"],
+            "duration": "2 weeks"
+        }
+    ],
+    "milestones": [
+        {
+            "week": 2,
+            "title": "OOP Mastery",
+            "requirements": ["Complete 3 coding exercises", "Build class hierarchy project"]
+        }
+    ]
+}
+
+_PLAN_SYSTEM_PROMPT = (
+    "Create a personalized learning plan based on the skill analysis provided by the user.\n\n"
+    "Generate a comprehensive course plan in JSON format:\n"
+    + json.dumps(_PLAN_EXAMPLE, separators=(",", ":"))
+)
+
+_PROGRESS_EXAMPLE = {
+    "progress_analysis": {
+        "completion_rate": 75,
+        "strong_areas": ["python basics", "problem solving"],
+        "weak_areas": ["advanced algorithms"],
+        "learning_pace": "on track"
+    },
+    "recommendations": [
+        "Focus more time on algorithm practice",
+        "Consider additional data structures course"
+    ],
+    "next_actions": [
+        "Complete module on binary trees",
+        "Practice coding problems on arrays"
+    ],
+    "estimated_completion": "2 weeks remaining",
+    "difficulty_adjustment": "maintain current level"
+}
+
+_PROGRESS_SYSTEM_PROMPT = (
+    "Analyze the learning progress provided by the user and give adaptive recommendations.\n\n"
+    "Return JSON with:\n"
+    + json.dumps(_PROGRESS_EXAMPLE, separators=(",", ":"))
+)
+
+# Top-level fields each response must carry, checked before it is returned or cached
+_ANALYSIS_FIELDS = {"extracted_skills": list, "skill_gaps": list, "career_level": str, "focus_areas": list}
+_PLAN_FIELDS = {"learning_path": dict, "courses": list, "projects": list, "milestones": list}
+_PROGRESS_FIELDS = {"progress_analysis": dict, "recommendations": list, "next_actions": list}
+
+def _parse_response(content, required_fields: Dict[str, type]) -> Dict[str, Any]:
+    """Parse model output and check it has the expected top-level shape"""
+    parsed = _loads(content)
+    if not isinstance(parsed, dict):
+        raise ValueError("AI response is not a JSON object")
+    for field_name, field_type in required_fields.items():
+        if not isinstance(parsed.get(field_name), field_type):
+            raise ValueError(f"AI response missing or invalid field: {field_name}")
+    return parsed
+
+# Trailing check only rejects letters so "html5" still counts but "java" does not match "javascript"
+_FALLBACK_SKILLS = ("python", "java", "javascript", "react", "node", "sql", "html", "css")
+_FALLBACK_SKILL_RE = re.compile(
+    r"\b(" + "|".join(sorted(map(re.escape, _FALLBACK_SKILLS), key=len, reverse=True)) + r")(?![a-z])",
+    re.IGNORECASE
+)
+
+def _resume_fingerprint(resume_text: str) -> str:
+    """
+    Reduce a resume to lowercase text with runs of whitespace collapsed.
+    
+    Resumes that differ only in case, spacing or line breaks share a
+    fingerprint and therefore a cached skill analysis. Punctuation is kept,
+    since "C++", "C#" and "C" are different skills.
+    """
+    return " ".join(resume_text.lower().split())
+
+def _skill_profile_key(skill_analysis: Dict[str, Any]) -> Optional[str]:
+    """
+    Canonical text for the parts of a skill analysis a course plan depends on.
+    
+    Skill order, casing and evidence wording are ignored, so users with the
+    same skills, gaps and level share one cached plan. Returns None for
+    analyses that do not have the expected shape.
+    """
+    skills = skill_analysis.get("extracted_skills")
+    if not isinstance(skills, list) or not all(isinstance(skill, dict) for skill in skills):
+        return None
+    return _dumps({
+        "skills": sorted(
+            f"{str(skill.get('skill', '')).lower()}:{str(skill.get('proficiency', '')).lower()}"
+            for skill in skills
+        ),
+        "skill_gaps": sorted(str(gap).lower() for gap in skill_analysis.get("skill_gaps") or ()),
+        "career_level": str(skill_analysis.get("career_level", "")).lower(),
+        "focus_areas": sorted(str(area).lower() for area in skill_analysis.get("focus_areas") or ())
+    })
+
+# Input budget for the resume in the analysis prompt; cost and latency grow with prompt length
+MAX_RESUME_PROMPT_CHARS = 4000
+
+def _trim_resume(resume_text: str) -> str:
+    """
+    Fit a resume into the prompt budget.
+    
+    Keeps the head of the resume up to a word boundary, then fills the rest
+    of the budget with distinct later lines that mention a known skill.
+    """
+    if len(resume_text) <= MAX_RESUME_PROMPT_CHARS:
+        return resume_text
+    
+    head_budget = MAX_RESUME_PROMPT_CHARS * 3 // 4
+    cut = max(resume_text.rfind(" ", 0, head_budget), resume_text.rfind("\n", 0, head_budget))
+    head = resume_text[:cut if cut > 0 else head_budget]
+    
+    remaining = MAX_RESUME_PROMPT_CHARS - len(head)
+    skill_lines = []
+    seen = set()
+    for line in resume_text[len(head):].splitlines():
+        line = line.strip()
+        if line and line not in seen and len(line) < remaining and _FALLBACK_SKILL_RE.search(line):
+            seen.add(line)
+            skill_lines.append(line)
+            remaining -= len(line) + 1
+    
+    if not skill_lines:
+        return head
+    return head + "\n" + "\n".join(skill_lines)
+
 class CourseGenerator:
     def __init__(self):
         self.api_key = os.environ.get("OPENAI_API_KEY")  # Will use OpenRouter API
         self.base_url = "https://openrouter.ai/api/v1"
         self.model = "openai/gpt-oss-20b:free"  # Using the specified model
+        # Request fields that are the same for every completion
+        self._base_payload = {
+            "model": self.model,
+            "response_format": {"type": "json_object"},
+            "max_tokens": 800
+        }
         
-    def analyze_resume_skills(self, resume_text: str) -> Dict[str, Any]:
-        """Analyze resume and extract detailed skill information"""
-        prompt = f"""
-        Analyze this resume and extract technical skills with proficiency levels and learning recommendations.
-        
-        Resume: {resume_text}
-        
-        Return JSON with this structure:
-        {{
-            "extracted_skills": [
-                {{
-                    "skill": "Python",
-                    "proficiency": "intermediate",
-                    "evidence": "3 years experience, built web apps",
-                    "category": "programming"
-                }}
-            ],
-            "skill_gaps": [
-                "Advanced algorithms",
-                "System design",
-                "Cloud platforms"
-            ],
-            "career_level": "mid-level",
-            "focus_areas": ["backend", "data science", "web development"]
-        }}
-        """
-        
+    def _call_llm_or_fallback(self, action: str, fallback: Callable[[], Dict[str, Any]],
+                              system_prompt: str, prompt: str, required_fields: Dict[str, type],
+                              cache_text: Optional[str] = None,
+                              cache_ttl: int = RESPONSE_CACHE_TTL) -> Dict[str, Any]:
+        """Run _call_llm, logging any failure and returning fallback() instead"""
         try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": self.model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "response_format": {"type": "json_object"},
-                    "max_tokens": 800
-                },
-                timeout=30
-            )
-            
-            response.raise_for_status()
-            result = response.json()
-            return json.loads(result['choices'][0]['message']['content'])
-                
+            return self._call_llm(system_prompt, prompt, required_fields, cache_text, cache_ttl)
         except requests.Timeout:
             logging.error("AI request timed out")
-            return self._fallback_skill_analysis(resume_text)
         except requests.RequestException as e:
             logging.error(f"AI request failed: {e}")
-            return self._fallback_skill_analysis(resume_text)
         except Exception as e:
-            logging.error(f"Error analyzing resume: {e}")
-            return self._fallback_skill_analysis(resume_text)
+            logging.error(f"Error {action}: {e}")
+        return fallback()
     
-    def generate_course_plan(self, skill_analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate personalized course plan based on skill analysis"""
-        prompt = f"""
-        Create a personalized learning plan based on this skill analysis:
+    def _call_llm(self, system_prompt: str, prompt: str, required_fields: Dict[str, type],
+                  cache_text: Optional[str] = None,
+                  cache_ttl: int = RESPONSE_CACHE_TTL) -> Dict[str, Any]:
+        """
+        Send a JSON-mode chat completion and return the parsed content.
         
-        Skills: {json.dumps(skill_analysis)}
+        The static instructions go first as the system message so the
+        provider's prefix cache can reuse them; identical requests are
+        answered from the local response cache, and concurrent identical
+        requests share a single upstream call. Responses missing any of
+        required_fields raise ValueError and are never cached.
         
-        Generate a comprehensive course plan in JSON format:
-        {{
-            "learning_path": {{
-                "title": "Personalized Development Path",
-                "duration": "12 weeks",
-                "difficulty": "intermediate"
-            }},
-            "courses": [
-                {{
-                    "id": "course_1",
-                    "title": "Advanced Python Programming",
-                    "description": "Master advanced Python concepts",
-                    "duration": "4 weeks",
-                    "difficulty": "intermediate",
-                    "modules": [
-                        {{
-                            "title": "Object-Oriented Programming",
-                            "duration": "1 week",
-                            "resources": [
-                                {{"type": "video", "title": "OOP Fundamentals", "url": "https://www.youtube.com/watch?v=example"}},
-                                {{"type": "article", "title": "Python Classes Guide", "url": "https://realpython.com/python3-object-oriented-programming/"}}
-                            ],
-                            "exercises": [
-                                "Create a class hierarchy for a library system",
-                                "Implement inheritance and polymorphism"
-                            ]
-                        }}
-                    ],
-                    "skills_covered": ["object-oriented programming", "design patterns"],
-                    "prerequisites": ["basic python"],
-                    "outcome": "Build complex applications using OOP principles"
-                }}
-            ],
-            "projects": [
-                {{
-                    "title": "Portfolio Website with Python Backend",
-                    "description": "Build a full-stack application",
-                    "skills_applied": ["python", "web development", "databases"],
-                    "duration": "2 weeks"
-                }}
-            ],
-            "milestones": [
-                {{
-                    "week": 2,
-                    "title": "OOP Mastery",
-                    "requirements": ["Complete 3 coding exercises", "Build class hierarchy project"]
-                }}
-            ]
-        }}
+        cache_text, when given, replaces the prompt in the cache key so
+        callers can map near-identical inputs onto one cached answer;
+        cache_ttl sets how long a fresh answer is kept.
         """
+        key_text = prompt if cache_text is None else cache_text
+        key = hashlib.sha256(f"{self.model}\0{system_prompt}\0{key_text}".encode()).hexdigest()
+        cached = _cache_get(key)
+        if cached is not None:
+            return _loads(cached)
+        
+        with _inflight_lock:
+            pending = _inflight.get(key)
+            if pending is None:
+                _inflight[key] = threading.Event()
+        
+        if pending is not None:
+            # Another thread is already asking the same question; reuse its answer
+            pending.wait(timeout=60)
+            cached = _cache_get(key)
+            if cached is not None:
+                return _loads(cached)
+            return _parse_response(self._request_completion(system_prompt, prompt), required_fields)
         
         try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": self.model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "response_format": {"type": "json_object"},
-                    "max_tokens": 800
-                },
-                timeout=30
-            )
-            
-            response.raise_for_status()
-            result = response.json()
-            return json.loads(result['choices'][0]['message']['content'])
-                
-        except requests.Timeout:
-            logging.error("AI request timed out")
-            return self._fallback_course_plan()
-        except requests.RequestException as e:
-            logging.error(f"AI request failed: {e}")
-            return self._fallback_course_plan()
-        except Exception as e:
-            logging.error(f"Error generating course plan: {e}")
-            return self._fallback_course_plan()
+            content = self._request_completion(system_prompt, prompt)
+            parsed = _parse_response(content, required_fields)
+            _cache_put(key, content, cache_ttl)
+            return parsed
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key).set()
     
-    def track_progress(self, user_progress: Dict[str, Any], course_plan: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze user progress and provide adaptive recommendations"""
-        prompt = f"""
-        Analyze learning progress and provide adaptive recommendations:
+    def _request_completion(self, system_prompt: str, prompt: str) -> str:
+        """POST one chat completion under the shared rate limits and return its content"""
+        payload = _dumps(self._base_payload | {
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ]
+        }).encode()
         
-        Current Progress: {json.dumps(user_progress)}
-        Course Plan: {json.dumps(course_plan)}
+        for attempt in range(1, LLM_MAX_ATTEMPTS + 1):
+            if not _rate_limiter.acquire(timeout=LLM_RATE_LIMIT_MAX_WAIT):
+                raise RuntimeError("LLM request budget exhausted")
+            try:
+                with _llm_slots:
+                    response = _get_session().post(
+                        f"{self.base_url}/chat/completions",
+                        headers={"Authorization": f"Bearer {self.api_key}"},
+                        data=payload,
+                        timeout=30
+                    )
+            except requests.ConnectionError:
+                if attempt == LLM_MAX_ATTEMPTS:
+                    raise
+                time.sleep(_retry_delay(attempt))
+                continue
+            
+            if response.status_code in _RETRYABLE_STATUSES and attempt < LLM_MAX_ATTEMPTS:
+                time.sleep(_retry_delay(attempt, response.headers.get("Retry-After")))
+                continue
+            
+            response.raise_for_status()
+            break
         
-        Return JSON with:
-        {{
-            "progress_analysis": {{
-                "completion_rate": 75,
-                "strong_areas": ["python basics", "problem solving"],
-                "weak_areas": ["advanced algorithms"],
-                "learning_pace": "on track"
-            }},
-            "recommendations": [
-                "Focus more time on algorithm practice",
-                "Consider additional data structures course"
-            ],
-            "next_actions": [
-                "Complete module on binary trees",
-                "Practice coding problems on arrays"
-            ],
-            "estimated_completion": "2 weeks remaining",
-            "difficulty_adjustment": "maintain current level"
-        }}
+        result = _loads(response.content)
+        return result['choices'][0]['message']['content']
+    
+    def generate_full_course(self, resume_text: str, user_progress: Optional[Dict[str, Any]] = None,
+                             current_plan: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
+        Run the resume analysis, course plan and progress review in one go.
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": self.model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "response_format": {"type": "json_object"},
-                    "max_tokens": 800
-                },
-                timeout=30
-            )
+        Calls that do not depend on each other run concurrently, so latency
+        is bounded by the slowest chain instead of the sum of all calls.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            progress_future = None
+            if user_progress is not None and current_plan is not None:
+                progress_future = executor.submit(self.track_progress, user_progress, current_plan)
             
-            response.raise_for_status()
-            result = response.json()
-            return json.loads(result['choices'][0]['message']['content'])
-                
-        except requests.Timeout:
-            logging.error("AI request timed out")
-            return self._fallback_progress_analysis()
-        except requests.RequestException as e:
-            logging.error(f"AI request failed: {e}")
-            return self._fallback_progress_analysis()
-        except Exception as e:
-            logging.error(f"Error tracking progress: {e}")
-            return self._fallback_progress_analysis()
+            skill_analysis = self.analyze_resume_skills(resume_text)
+            course_plan = self.generate_course_plan(skill_analysis)
+            
+            return {
+                "skill_analysis": skill_analysis,
+                "course_plan": course_plan,
+                "progress_analysis": progress_future.result() if progress_future else None
+            }
+    
+    def analyze_resumes(self, resume_texts: List[str]) -> List[Dict[str, Any]]:
+        """Analyze several resumes concurrently, preserving input order"""
+        if not resume_texts:
+            return []
+        workers = min(MAX_CONCURRENT_LLM_CALLS, len(resume_texts))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.analyze_resume_skills, resume_texts))
+    
+    def analyze_resume_skills(self, resume_text: str) -> Dict[str, Any]:
+        """Analyze resume and extract detailed skill information"""
+        trimmed = _trim_resume(resume_text)
+        prompt = f"Resume: {trimmed}"
+        
+        return self._call_llm_or_fallback(
+            "analyzing resume", lambda: self._fallback_skill_analysis(resume_text),
+            _ANALYZE_SYSTEM_PROMPT, prompt, _ANALYSIS_FIELDS, cache_text=_resume_fingerprint(trimmed)
+        )
+    
+    def generate_course_plan(self, skill_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate personalized course plan based on skill analysis"""
+        prompt = f"Skills: {_dumps(skill_analysis)}"
+        
+        return self._call_llm_or_fallback(
+            "generating course plan", self._fallback_course_plan,
+            _PLAN_SYSTEM_PROMPT, prompt, _PLAN_FIELDS,
+            cache_text=_skill_profile_key(skill_analysis), cache_ttl=PLAN_CACHE_TTL
+        )
+    
+    def track_progress(self, user_progress: Dict[str, Any], course_plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze user progress and provide adaptive recommendations"""
+        prompt = f"Current Progress: {_dumps(user_progress)}\nCourse Plan: {_dumps(course_plan)}"
+        
+        return self._call_llm_or_fallback(
+            "tracking progress", self._fallback_progress_analysis,
+            _PROGRESS_SYSTEM_PROMPT, prompt, _PROGRESS_FIELDS
+        )
     
     def _fallback_skill_analysis(self, resume_text: str) -> Dict[str, Any]:
         """Fallback skill analysis when AI is unavailable"""
-        # Simple keyword extraction as fallback
-        programming_skills = ["python", "java", "javascript", "react", "node", "sql", "html", "css"]
-        found_skills = []
-        
-        text_lower = resume_text.lower()
-        for skill in programming_skills:
-            if skill in text_lower:
-                found_skills.append({
-                    "skill": skill.title(),
-                    "proficiency": "intermediate",
-                    "evidence": f"Mentioned in resume",
-                    "category": "programming"
-                })
+        # Simple keyword extraction as fallback: one pass over the resume
+        mentioned = {match.lower() for match in _FALLBACK_SKILL_RE.findall(resume_text)}
+        found_skills = [
+            {
+                "skill": skill.title(),
+                "proficiency": "intermediate",
+                "evidence": "Mentioned in resume",
+                "category": "programming"
+            }
+            for skill in _FALLBACK_SKILLS if skill in mentioned
+        ]
         
         return {
             "extracted_skills": found_skills,
@@ -316,7 +577,8 @@ class CourseGenerator:
         This method creates a comprehensive course structure that demonstrates
         the AI capabilities of the platform for presentation purposes.
         """
-        skill_list = [skill.strip() for skill in skills.split(',') if skill.strip()]
+        skill_list = [skill for skill in map(str.strip, skills.split(',')) if skill]
+        skill_count = len(skill_list)
         primary_skill = skill_list[0] if skill_list else "Programming"
         
         return {
@@ -350,8 +612,8 @@ class CourseGenerator:
                 }
             ],
             'ai_analytics': {
-                'predicted_completion_time': f'{len(skill_list) * 2} weeks',
+                'predicted_completion_time': f'{skill_count * 2} weeks',
                 'success_probability': '87%',
-                'skill_gap_analysis': f'Identified {len(skill_list)} strong areas, 3 growth opportunities'
+                'skill_gap_analysis': f'Identified {skill_count} strong areas, 3 growth opportunities'
             }
         }
\ No newline at end of file
@@ -11,39 +11,408 @@ This module handles all AI service integrations including:
 - Learning path recommendations
 """
 
+import copy
+import hashlib
 import os
 import json
 import logging
-import requests
-from typing import Dict, List, Any, Optional
-from openai import OpenAI
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+from json_codec import loads as _loads
+from skill_matching import COMMON_SKILLS, find_skills
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
+# The OpenAI client is created by AIServiceManager on first use
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
-openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+
+# the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
+# Question and learning path generation use it; lightweight classification
+# (skill extraction, sentiment) runs on the smaller SKILL_MODEL
+OPENAI_MODEL = "gpt-4o"
+SKILL_MODEL = os.environ.get("SKILL_MODEL", "gpt-4o-mini")
 
 # API Configuration
 HUGGINGFACE_API_URL = "https://api-inference.huggingface.co/models"
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1"
+OPENROUTER_API_KEY = os.environ.get("OPENROUTER_API_KEY")
+HUGGINGFACE_API_KEY = os.environ.get("HUGGINGFACE_API_KEY")
+OPENROUTER_MODEL = f"openai/{OPENAI_MODEL}"
+HUGGINGFACE_MODEL = "mistralai/Mixtral-8x7B-Instruct-v0.1"
+
+# Pooled keep-alive session for the OpenRouter and Hugging Face fallbacks,
+# created (and requests imported) the first time a fallback is needed
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def _get_http_session():
+    """
+    Return the shared fallback session. Only connection failures are retried
+    here; slow or failing replies move on to the next provider instead.
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(
+                    pool_connections=10,
+                    pool_maxsize=50,
+                    max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3)
+                ))
+                _http_session = session
+    return _http_session
+
+# Per-provider timeouts (seconds) for each feature, sized to its max_tokens so a
+# stalled provider is abandoned quickly without cutting off normal answers
+SKILL_EXTRACTION_TIMEOUT = 10.0
+QUESTIONS_TIMEOUT = 25.0
+LEARNING_PATH_TIMEOUT = 25.0
+SENTIMENT_TIMEOUT = 5.0
+PIPELINE_TIMEOUT = 40.0
+
+# Resumes up to this length get skills, questions and modules from one fused
+# request; longer ones use the per-section calls so each gets the full budget
+FUSED_PIPELINE_MAX_CHARS = 6000
+
+# A provider that fails this many times in a row is skipped for PROVIDER_COOLDOWN seconds
+PROVIDER_FAILURE_THRESHOLD = 2
+PROVIDER_COOLDOWN = 30.0
+
+# Display titles for the fallback skill extractor
+_SKILL_TITLES = {skill: skill.title() for skill in COMMON_SKILLS}
+
+class _LRUCache:
+    """Small thread-safe LRU map for AI results; values are copied on the way in and out"""
+    
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        # key -> Event set once the caller computing that key has finished
+        self._inflight: Dict[str, threading.Event] = {}
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached value, or None on a miss."""
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            value = self._data[key]
+        return copy.deepcopy(value)
+    
+    def put(self, key: str, value: Any):
+        """Store a copy of value, evicting the least recently used entries."""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def get_or_compute(self, key: str, compute, wait_timeout: float = 30.0) -> Any:
+        """
+        Return the cached value for key, calling compute() and storing its
+        result on a miss. Concurrent misses on the same key wait for the
+        first caller instead of repeating the work, and only compute it
+        themselves if that call failed or took longer than wait_timeout.
+        """
+        with self._lock:
+            pending = self._inflight.get(key)
+            leader = pending is None and key not in self._data
+            if leader:
+                self._inflight[key] = threading.Event()
+        
+        if pending is not None:
+            pending.wait(wait_timeout)
+        if not leader:
+            value = self.get(key)
+            if value is not None:
+                return value
+        
+        try:
+            value = compute()
+            self.put(key, value)
+            return value
+        finally:
+            if leader:
+                with self._lock:
+                    self._inflight.pop(key).set()
+
+def _cache_key(*parts: Any) -> str:
+    """Stable SHA-1 key over JSON-encodable parts"""
+    return hashlib.sha1(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+# Only successful OpenAI answers are cached, so fallbacks never outlive an outage
+_skills_cache = _LRUCache()
+_questions_cache = _LRUCache()
+_learning_path_cache = _LRUCache()
+_sentiment_cache = _LRUCache()
+
+def _normalize_text(text: str) -> str:
+    """
+    Lowercase text with whitespace collapsed, so spacing-only edits share a
+    cache entry. Punctuation is kept: "C++" and "C#", or ":)" and ":(", differ.
+    """
+    return " ".join(text.lower().split())
+
+_SKILL_EXTRACTION_PROMPT = """You are an expert resume analyzer. Extract technical skills from the resume text. 
+                        Focus on programming languages, frameworks, databases, tools, and technologies.
+                        Return only a JSON array of skill names, no explanations.
+                        Example: ["Python", "JavaScript", "React", "SQL", "Docker"]"""
+
+def _skill_extraction_request(resume_text: str) -> Dict[str, Any]:
+    """Chat completion parameters for skill extraction, shared by live and batch calls."""
+    return {
+        "model": SKILL_MODEL,
+        "messages": [
+            {
+                "role": "system",
+                "content": _SKILL_EXTRACTION_PROMPT
+            },
+            {
+                "role": "user",
+                "content": f"Extract technical skills from this resume:\n\n{resume_text}"
+            }
+        ],
+        "response_format": {"type": "json_object"},
+        "max_tokens": 200,
+        "temperature": 0.1
+    }
+
+_PIPELINE_PROMPT = """You are an expert resume analyzer, technical interviewer and curriculum designer.
+From the resume, extract the candidate's technical skills (programming languages, frameworks,
+databases, tools, and technologies), then write assessment questions for those skills and a
+learning path that builds on them and covers any listed skill gaps.
+Return a JSON object with:
+- skills: array of skill names
+- questions: array of objects with question, skill, difficulty (beginner/intermediate/advanced),
+  points (10-25) and time_limit (seconds, 60-300)
+- modules: array of objects with module_name, description, difficulty (beginner/intermediate/advanced),
+  estimated_hours (1-20), prerequisites and skills_covered (array of skills taught)"""
+
+_LEARNING_PATH_PROMPT = """You are an expert curriculum designer. Create a personalized learning path 
+                        based on current skills and skill gaps. Return a JSON object with 'modules' array.
+                        Each module should have:
+                        - module_name: Clear, descriptive name
+                        - description: What the module covers
+                        - difficulty: beginner/intermediate/advanced
+                        - estimated_hours: Time to complete (1-20 hours)
+                        - prerequisites: Required prior knowledge
+                        - skills_covered: Array of skills taught"""
+
+def _learning_path_messages(skills: List[str], skill_gaps: List[str] = None) -> List[Dict[str, str]]:
+    """Chat messages for learning path generation, shared by the buffered and streaming calls."""
+    skills_str = ", ".join(skills) if skills else "Beginner"
+    gaps_str = ", ".join(skill_gaps) if skill_gaps else "None specified"
+    return [
+        {"role": "system", "content": _LEARNING_PATH_PROMPT},
+        {
+            "role": "user",
+            "content": f"Create a learning path for someone with skills: {skills_str}. Focus on gaps: {gaps_str}"
+        }
+    ]
+
+class _ArrayItemStream:
+    """
+    Incrementally cut complete objects out of a streamed JSON array.
+    
+    Fed raw text chunks, it waits for the named array to open and returns
+    each element object as soon as its closing brace arrives.
+    """
+    
+    def __init__(self, array_key: str):
+        self._marker = f'"{array_key}"'
+        self._buffer = ""
+        self._pos = -1  # scan position once inside the array
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_start = 0
+        self.closed = False
+    
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Add a chunk of model output and return any newly completed items."""
+        self._buffer += chunk
+        if self._pos < 0:
+            marker = self._buffer.find(self._marker)
+            bracket = self._buffer.find("[", marker + len(self._marker)) if marker >= 0 else -1
+            if bracket < 0:
+                return []
+            self._pos = bracket + 1
+        
+        items = []
+        buffer = self._buffer
+        while self._pos < len(buffer) and not self.closed:
+            char = buffer[self._pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._item_start = self._pos
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    items.append(_loads(buffer[self._item_start:self._pos + 1]))
+            elif char == "]" and self._depth == 0:
+                self.closed = True
+            self._pos += 1
+        return items
 
 class AIServiceManager:
     """Manages all AI service integrations and provides fallback mechanisms."""
     
     def __init__(self):
-        self.openai_available = bool(OPENAI_API_KEY and openai_client)
+        self.openai_client = self._create_openai_client()
+        self.openai_available = bool(OPENAI_API_KEY and self.openai_client)
+        self.openrouter_available = bool(OPENROUTER_API_KEY)
+        self.huggingface_available = bool(HUGGINGFACE_API_KEY)
+        self.llm_available = self.openai_available or self.openrouter_available or self.huggingface_available
+        # provider -> (consecutive failures, time of last failure)
+        self._provider_health: Dict[str, Tuple[int, float]] = {}
+        self._health_lock = threading.Lock()
         self.services_status = self._check_service_availability()
         
+    @staticmethod
+    def _create_openai_client():
+        """OpenAI client for OPENAI_API_KEY, or None without a key or the SDK."""
+        if not OPENAI_API_KEY:
+            return None
+        # Imported here so serving routes that never touch AI skips loading the SDK
+        try:
+            from openai import OpenAI
+        except ImportError as e:
+            logger.warning(f"OpenAI SDK not available: {e}")
+            return None
+        return OpenAI(api_key=OPENAI_API_KEY)
+    
     def _check_service_availability(self) -> Dict[str, bool]:
         """Check which AI services are available."""
         return {
             'openai': self.openai_available,
+            'openrouter': self.openrouter_available,
             'huggingface': True,  # Assume available
             'transformers': True  # Local library
         }
     
+    def _llm_call(self, messages: List[Dict[str, str]], max_tokens: int,
+                  temperature: float, timeout: float,
+                  model: str = OPENAI_MODEL) -> Dict[str, Any]:
+        """
+        Run a JSON-mode chat completion through the provider chain.
+        
+        Tries OpenAI, then OpenRouter, then Hugging Face, each with its own
+        timeout, skipping providers that are cooling down after repeated
+        failures. model names the OpenAI model; OpenRouter serves the same
+        one and Hugging Face always uses HUGGINGFACE_MODEL. Raises
+        RuntimeError when no provider produced an answer.
+        """
+        providers = (
+            ('openai', self.openai_available, self._call_openai),
+            ('openrouter', self.openrouter_available, self._call_openrouter),
+            ('huggingface', self.huggingface_available, self._call_huggingface),
+        )
+        
+        for name, available, call in providers:
+            if not available or not self._provider_ready(name):
+                continue
+            try:
+                result = call(messages, max_tokens, temperature, timeout, model)
+            except Exception as e:
+                logger.warning(f"{name} request failed: {e}")
+                self._record_provider_result(name, success=False)
+                continue
+            self._record_provider_result(name, success=True)
+            return result
+        
+        raise RuntimeError("No AI provider available")
+    
+    def _provider_ready(self, name: str) -> bool:
+        """False while a repeatedly failing provider is in its cooldown window."""
+        with self._health_lock:
+            failures, last_failure = self._provider_health.get(name, (0, 0.0))
+        return failures < PROVIDER_FAILURE_THRESHOLD or time.monotonic() - last_failure >= PROVIDER_COOLDOWN
+    
+    def _record_provider_result(self, name: str, success: bool):
+        """Reset a provider's failure count on success, or count another failure."""
+        with self._health_lock:
+            if success:
+                self._provider_health.pop(name, None)
+            else:
+                failures = self._provider_health.get(name, (0, 0.0))[0]
+                self._provider_health[name] = (failures + 1, time.monotonic())
+    
+    def _call_openai(self, messages: List[Dict[str, str]], max_tokens: int,
+                     temperature: float, timeout: float, model: str) -> Dict[str, Any]:
+        """Chat completion through the OpenAI client."""
+        response = self.openai_client.with_options(timeout=timeout).chat.completions.create(
+            model=model,
+            messages=messages,
+            response_format={"type": "json_object"},
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return _loads(response.choices[0].message.content)
+    
+    def _call_openrouter(self, messages: List[Dict[str, str]], max_tokens: int,
+                         temperature: float, timeout: float, model: str) -> Dict[str, Any]:
+        """Chat completion through OpenRouter's OpenAI-compatible endpoint."""
+        response = _get_http_session().post(
+            f"{OPENROUTER_API_URL}/chat/completions",
+            headers={"Authorization": f"Bearer {OPENROUTER_API_KEY}"},
+            json={
+                "model": f"openai/{model}",
+                "messages": messages,
+                "response_format": {"type": "json_object"},
+                "max_tokens": max_tokens,
+                "temperature": temperature
+            },
+            timeout=timeout
+        )
+        response.raise_for_status()
+        return _loads(_loads(response.content)['choices'][0]['message']['content'])
+    
+    def _call_huggingface(self, messages: List[Dict[str, str]], max_tokens: int,
+                          temperature: float, timeout: float, model: str) -> Dict[str, Any]:
+        """Text generation through the Hugging Face inference API, parsed as JSON."""
+        prompt = "\n\n".join(message['content'] for message in messages) + "\n\nRespond with a single JSON object."
+        response = _get_http_session().post(
+            f"{HUGGINGFACE_API_URL}/{HUGGINGFACE_MODEL}",
+            headers={"Authorization": f"Bearer {HUGGINGFACE_API_KEY}"},
+            json={
+                "inputs": f"[INST] {prompt} [/INST]",
+                "parameters": {
+                    "max_new_tokens": max_tokens,
+                    "temperature": max(temperature, 0.01),
+                    "return_full_text": False
+                }
+            },
+            timeout=timeout
+        )
+        response.raise_for_status()
+        text = _loads(response.content)[0]['generated_text']
+        start, end = text.find('{'), text.rfind('}')
+        if start == -1 or end < start:
+            raise ValueError("Hugging Face response contained no JSON object")
+        return _loads(text[start:end + 1])
+    
     def extract_skills_with_ai(self, resume_text: str) -> List[str]:
         """
         Extract skills from resume text using AI with multiple fallback options.
@@ -55,9 +424,10 @@ class AIServiceManager:
             List of extracted skills
         """
         try:
-            # Primary: Use OpenAI GPT-4o for skill extraction
-            if self.openai_available:
-                return self._extract_skills_openai(resume_text)
+            # Primary: Use OpenAI (SKILL_MODEL) for skill extraction
+            if self.llm_available:
+                key = _cache_key(_normalize_text(resume_text))
+                return _skills_cache.get_or_compute(key, lambda: self._extract_skills_openai(resume_text))
             
             # Fallback: Use keyword-based extraction
             logger.warning("OpenAI not available, using keyword-based extraction")
@@ -68,31 +438,16 @@ class AIServiceManager:
             return self._extract_skills_keywords(resume_text)
     
     def _extract_skills_openai(self, resume_text: str) -> List[str]:
-        """Extract skills using OpenAI GPT-4o."""
+        """Extract skills using the lightweight SKILL_MODEL."""
         try:
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
-            response = openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": """You are an expert resume analyzer. Extract technical skills from the resume text. 
-                        Focus on programming languages, frameworks, databases, tools, and technologies.
-                        Return only a JSON array of skill names, no explanations.
-                        Example: ["Python", "JavaScript", "React", "SQL", "Docker"]"""
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Extract technical skills from this resume:\n\n{resume_text}"
-                    }
-                ],
-                response_format={"type": "json_object"},
-                max_tokens=500,
-                temperature=0.1
+            request = _skill_extraction_request(resume_text)
+            result = self._llm_call(
+                messages=request["messages"],
+                max_tokens=request["max_tokens"],
+                temperature=request["temperature"],
+                timeout=SKILL_EXTRACTION_TIMEOUT,
+                model=request["model"]
             )
-            
-            result = json.loads(response.choices[0].message.content)
             skills = result.get('skills', [])
             
             logger.info(f"OpenAI extracted {len(skills)} skills: {skills}")
@@ -104,22 +459,98 @@ class AIServiceManager:
     
     def _extract_skills_keywords(self, resume_text: str) -> List[str]:
         """Fallback keyword-based skill extraction."""
-        common_skills = [
-            'python', 'java', 'javascript', 'react', 'flask', 'django', 'sql', 'html', 'css', 'git',
-            'node.js', 'angular', 'vue', 'postgresql', 'mysql', 'mongodb', 'docker', 'kubernetes',
-            'aws', 'azure', 'machine learning', 'data science', 'api', 'rest', 'microservices',
-            'typescript', 'c++', 'c#', 'ruby', 'php', 'golang', 'rust', 'swift', 'tensorflow',
-            'pytorch', 'redis', 'elasticsearch', 'jenkins', 'gitlab', 'linux', 'bash'
+        mentioned = find_skills(resume_text.lower())
+        
+        found_skills = [_SKILL_TITLES[skill] for skill in COMMON_SKILLS if skill in mentioned]
+        
+        return found_skills
+    
+    def submit_skill_extraction_batch(self, resume_texts: List[str]) -> Optional[str]:
+        """
+        Queue skill extraction for many resumes through the OpenAI Batch API.
+        
+        Batch jobs are billed at half price and draw on a separate rate limit,
+        but complete asynchronously (within 24 hours), so this suits bulk
+        imports rather than interactive uploads.
+        
+        Args:
+            resume_texts: Resume texts to analyze
+            
+        Returns:
+            The batch id to pass to collect_skill_extraction_batch, or None if
+            OpenAI is unavailable or the submission failed
+        """
+        if not self.openai_available or not resume_texts:
+            return None
+        
+        lines = [
+            json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": _skill_extraction_request(resume_text)
+            })
+            for index, resume_text in enumerate(resume_texts)
         ]
         
-        resume_lower = resume_text.lower()
-        found_skills = []
+        try:
+            batch_file = self.openai_client.files.create(
+                file=("skill_extraction.jsonl", "\n".join(lines).encode()),
+                purpose="batch"
+            )
+            batch = self.openai_client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            logger.info(f"Submitted skill extraction batch {batch.id} for {len(resume_texts)} resumes")
+            return batch.id
+            
+        except Exception as e:
+            logger.error(f"OpenAI batch submission failed: {e}")
+            return None
+    
+    def collect_skill_extraction_batch(self, batch_id: str, resume_texts: List[str]) -> Optional[List[List[str]]]:
+        """
+        Fetch the results of a batch queued by submit_skill_extraction_batch.
+        
+        Args:
+            batch_id: Id returned when the batch was submitted
+            resume_texts: The same resume texts, in the same order
+            
+        Returns:
+            Skills per resume aligned with resume_texts, or None while the batch
+            is still running. Resumes the batch could not analyze fall back to
+            keyword extraction.
+        """
+        batch = self.openai_client.batches.retrieve(batch_id)
+        if batch.status in ("validating", "in_progress", "finalizing", "cancelling"):
+            return None
         
-        for skill in common_skills:
-            if skill.lower() in resume_lower:
-                found_skills.append(skill.title())
+        results: List[Optional[List[str]]] = [None] * len(resume_texts)
+        if batch.output_file_id:
+            for line in self.openai_client.files.content(batch.output_file_id).text.splitlines():
+                if not line:
+                    continue
+                try:
+                    record = _loads(line)
+                    body = record["response"]["body"]
+                    index = int(record["custom_id"])
+                    skills = _loads(body["choices"][0]["message"]["content"]).get('skills', [])
+                except (KeyError, IndexError, TypeError, ValueError) as e:
+                    logger.warning(f"Skipping unreadable batch result in {batch_id}: {e}")
+                    continue
+                if 0 <= index < len(results):
+                    results[index] = skills
+                    _skills_cache.put(_cache_key(_normalize_text(resume_texts[index])), skills)
         
-        return found_skills
+        if batch.status != "completed":
+            logger.warning(f"Skill extraction batch {batch_id} ended with status {batch.status}")
+        
+        return [
+            skills if skills is not None else self._extract_skills_keywords(resume_text)
+            for skills, resume_text in zip(results, resume_texts)
+        ]
     
     def generate_assessment_questions(self, skills: List[str], num_questions: int = 5) -> List[Dict]:
         """
@@ -133,8 +564,11 @@ class AIServiceManager:
             List of question dictionaries
         """
         try:
-            if self.openai_available and skills:
-                return self._generate_questions_openai(skills, num_questions)
+            if self.llm_available and skills:
+                key = _cache_key(sorted(map(str, skills)), num_questions)
+                return _questions_cache.get_or_compute(
+                    key, lambda: self._generate_questions_openai(skills, num_questions)
+                )
             else:
                 return self._generate_questions_template(skills, num_questions)
                 
@@ -147,8 +581,7 @@ class AIServiceManager:
         try:
             skills_str = ", ".join(skills)
             
-            response = openai_client.chat.completions.create(
-                model="gpt-4o",
+            result = self._llm_call(
                 messages=[
                     {
                         "role": "system",
@@ -166,12 +599,10 @@ class AIServiceManager:
                         "content": f"Generate {num_questions} assessment questions for someone with these skills: {skills_str}"
                     }
                 ],
-                response_format={"type": "json_object"},
                 max_tokens=1500,
-                temperature=0.7
+                temperature=0.7,
+                timeout=QUESTIONS_TIMEOUT
             )
-            
-            result = json.loads(response.choices[0].message.content)
             questions = result.get('questions', [])
             
             logger.info(f"OpenAI generated {len(questions)} assessment questions")
@@ -255,8 +686,11 @@ class AIServiceManager:
             List of learning modules
         """
         try:
-            if self.openai_available:
-                return self._generate_learning_path_openai(skills, skill_gaps)
+            if self.llm_available:
+                key = _cache_key(sorted(map(str, skills or [])), sorted(map(str, skill_gaps or [])))
+                return _learning_path_cache.get_or_compute(
+                    key, lambda: self._generate_learning_path_openai(skills, skill_gaps)
+                )
             else:
                 return self._generate_learning_path_template(skills, skill_gaps)
                 
@@ -267,35 +701,12 @@ class AIServiceManager:
     def _generate_learning_path_openai(self, skills: List[str], skill_gaps: List[str] = None) -> List[Dict]:
         """Generate learning path using OpenAI."""
         try:
-            skills_str = ", ".join(skills) if skills else "Beginner"
-            gaps_str = ", ".join(skill_gaps) if skill_gaps else "None specified"
-            
-            response = openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert curriculum designer. Create a personalized learning path 
-                        based on current skills and skill gaps. Return a JSON object with 'modules' array.
-                        Each module should have:
-                        - module_name: Clear, descriptive name
-                        - description: What the module covers
-                        - difficulty: beginner/intermediate/advanced
-                        - estimated_hours: Time to complete (1-20 hours)
-                        - prerequisites: Required prior knowledge
-                        - skills_covered: Array of skills taught"""
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Create a learning path for someone with skills: {skills_str}. Focus on gaps: {gaps_str}"
-                    }
-                ],
-                response_format={"type": "json_object"},
+            result = self._llm_call(
+                messages=_learning_path_messages(skills, skill_gaps),
                 max_tokens=1200,
-                temperature=0.6
+                temperature=0.6,
+                timeout=LEARNING_PATH_TIMEOUT
             )
-            
-            result = json.loads(response.choices[0].message.content)
             modules = result.get('modules', [])
             
             logger.info(f"OpenAI generated {len(modules)} learning modules")
@@ -305,6 +716,60 @@ class AIServiceManager:
             logger.error(f"OpenAI learning path generation failed: {e}")
             raise
     
+    def stream_learning_path(self, skills: List[str], skill_gaps: List[str] = None) -> Iterator[Dict]:
+        """
+        Yield learning path modules as the model produces them.
+        
+        Streams from OpenAI so the first module can be shown while the rest
+        are still being generated. Falls back to generate_learning_path (and
+        its provider chain and templates) if streaming cannot start.
+        
+        Args:
+            skills: Current user skills
+            skill_gaps: Skills that need improvement
+            
+        Yields:
+            Learning module dictionaries
+        """
+        key = _cache_key(sorted(map(str, skills or [])), sorted(map(str, skill_gaps or [])))
+        cached = _learning_path_cache.get(key)
+        if cached is not None:
+            yield from cached
+            return
+        
+        if not self.openai_available or not self._provider_ready('openai'):
+            yield from self.generate_learning_path(skills, skill_gaps)
+            return
+        
+        modules = []
+        parser = _ArrayItemStream('modules')
+        try:
+            stream = self.openai_client.with_options(timeout=LEARNING_PATH_TIMEOUT).chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=_learning_path_messages(skills, skill_gaps),
+                response_format={"type": "json_object"},
+                max_tokens=1200,
+                temperature=0.6,
+                stream=True
+            )
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                for module in parser.feed(chunk.choices[0].delta.content or ""):
+                    modules.append(module)
+                    yield module
+        except Exception as e:
+            logger.error(f"OpenAI learning path streaming failed: {e}")
+            self._record_provider_result('openai', success=False)
+            if not modules:
+                yield from self.generate_learning_path(skills, skill_gaps)
+            return
+        
+        self._record_provider_result('openai', success=True)
+        if parser.closed:
+            _learning_path_cache.put(key, modules)
+        logger.info(f"OpenAI streamed {len(modules)} learning modules")
+    
     def _generate_learning_path_template(self, skills: List[str], skill_gaps: List[str] = None) -> List[Dict]:
         """Fallback template-based learning path generation."""
         base_modules = [
@@ -352,6 +817,98 @@ class AIServiceManager:
         
         return base_modules
     
+    def run_pipeline(self, resume_text: str, num_questions: int = 5,
+                     skill_gaps: List[str] = None) -> Dict[str, Any]:
+        """
+        Extract skills, then generate questions and a learning path for them.
+        
+        Resumes up to FUSED_PIPELINE_MAX_CHARS are answered by one fused
+        request. Otherwise, or if the fused answer was malformed, the question
+        and learning path calls run concurrently once the skills are known,
+        since both depend only on them. If every provider failed on the fused
+        request, the keyword and template fallbacks answer straight away.
+        
+        Args:
+            resume_text: The raw text content of the resume
+            num_questions: Number of assessment questions to generate
+            skill_gaps: Skills that need improvement
+            
+        Returns:
+            Dictionary with skills, questions and learning_path
+        """
+        if self.llm_available and len(resume_text) <= FUSED_PIPELINE_MAX_CHARS:
+            fused = self._run_fused_pipeline(resume_text, num_questions, skill_gaps)
+            if fused is not None:
+                return fused
+        
+        skills = self.extract_skills_with_ai(resume_text)
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            questions = executor.submit(self.generate_assessment_questions, skills, num_questions)
+            learning_path = executor.submit(self.generate_learning_path, skills, skill_gaps)
+            
+            return {
+                'skills': skills,
+                'questions': questions.result(),
+                'learning_path': learning_path.result()
+            }
+    
+    def _run_fused_pipeline(self, resume_text: str, num_questions: int,
+                            skill_gaps: List[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Produce skills, questions and modules from a single LLM request.
+        
+        One round-trip with one shared system prompt replaces three. Results
+        are written to the per-feature caches. Returns None when the skills
+        are already cached (the split calls are then cheaper) or the fused
+        answer is unusable, so the caller falls back to the split pipeline.
+        When no provider answered at all, returns the keyword and template
+        fallbacks instead, since the split calls would wait on the same
+        failing providers again.
+        """
+        skills_key = _cache_key(_normalize_text(resume_text))
+        if _skills_cache.get(skills_key) is not None:
+            return None
+        
+        gaps_str = ", ".join(skill_gaps) if skill_gaps else "None specified"
+        try:
+            result = self._llm_call(
+                messages=[
+                    {"role": "system", "content": _PIPELINE_PROMPT},
+                    {
+                        "role": "user",
+                        "content": f"Skill gaps: {gaps_str}\nNumber of questions: {num_questions}\n\nResume:\n{resume_text}"
+                    }
+                ],
+                max_tokens=3000,
+                temperature=0.5,
+                timeout=PIPELINE_TIMEOUT
+            )
+        except Exception as e:
+            logger.error(f"Fused AI pipeline failed: {e}")
+            skills = self._extract_skills_keywords(resume_text)
+            return {
+                'skills': skills,
+                'questions': self._generate_questions_template(skills, num_questions),
+                'learning_path': self._generate_learning_path_template(skills, skill_gaps)
+            }
+        
+        skills, questions, modules = result.get('skills'), result.get('questions'), result.get('modules')
+        if not isinstance(skills, list) or not isinstance(questions, list) or not isinstance(modules, list):
+            logger.warning("Fused AI pipeline returned an incomplete result")
+            return None
+        
+        _skills_cache.put(skills_key, skills)
+        _questions_cache.put(_cache_key(sorted(map(str, skills)), num_questions), questions)
+        _learning_path_cache.put(_cache_key(sorted(map(str, skills)), sorted(map(str, skill_gaps or []))), modules)
+        
+        logger.info(f"Fused AI pipeline produced {len(skills)} skills, {len(questions)} questions, {len(modules)} modules")
+        return {
+            'skills': skills,
+            'questions': questions,
+            'learning_path': modules
+        }
+    
     def analyze_text_sentiment(self, text: str) -> Dict[str, float]:
         """
         Analyze sentiment of text using AI.
@@ -363,28 +920,9 @@ class AIServiceManager:
             Dictionary with sentiment scores
         """
         try:
-            if self.openai_available:
-                response = openai_client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": """Analyze the sentiment of the text. Return JSON with:
-                            - sentiment: positive/negative/neutral
-                            - confidence: 0.0 to 1.0
-                            - score: -1.0 (very negative) to 1.0 (very positive)"""
-                        },
-                        {
-                            "role": "user",
-                            "content": f"Analyze sentiment: {text}"
-                        }
-                    ],
-                    response_format={"type": "json_object"},
-                    max_tokens=200,
-                    temperature=0.1
-                )
-                
-                return json.loads(response.choices[0].message.content)
+            if self.llm_available:
+                key = _cache_key(_normalize_text(text))
+                return _sentiment_cache.get_or_compute(key, lambda: self._analyze_sentiment_openai(text))
             
         except Exception as e:
             logger.error(f"Sentiment analysis failed: {e}")
@@ -396,12 +934,38 @@ class AIServiceManager:
             'score': 0.0
         }
     
+    def _analyze_sentiment_openai(self, text: str) -> Dict[str, float]:
+        """Score sentiment with the lightweight SKILL_MODEL."""
+        return self._llm_call(
+            messages=[
+                {
+                    "role": "system",
+                    "content": """Analyze the sentiment of the text. Return JSON with:
+                            - sentiment: positive/negative/neutral
+                            - confidence: 0.0 to 1.0
+                            - score: -1.0 (very negative) to 1.0 (very positive)"""
+                },
+                {
+                    "role": "user",
+                    "content": f"Analyze sentiment: {text}"
+                }
+            ],
+            max_tokens=50,
+            temperature=0.1,
+            timeout=SENTIMENT_TIMEOUT,
+            model=SKILL_MODEL
+        )
+    
     def get_service_status(self) -> Dict[str, Any]:
         """Get current status of all AI services."""
         return {
             'openai': {
                 'available': self.openai_available,
-                'model': 'gpt-4o' if self.openai_available else None
+                'model': OPENAI_MODEL if self.openai_available else None
+            },
+            'openrouter': {
+                'available': self.openrouter_available,
+                'model': OPENROUTER_MODEL if self.openrouter_available else None
             },
             'huggingface': {
                 'available': True,
@@ -411,22 +975,48 @@ class AIServiceManager:
             'fallback_enabled': True
         }
 
-# Global AI service manager instance
-ai_service_manager = AIServiceManager()
+# Global AI service manager instance, created on first use
+_ai_service_manager: Optional[AIServiceManager] = None
+_ai_service_manager_lock = threading.Lock()
+
+def _get_manager() -> AIServiceManager:
+    """Shared AIServiceManager, built (and the OpenAI SDK imported) on first call."""
+    global _ai_service_manager
+    if _ai_service_manager is None:
+        with _ai_service_manager_lock:
+            if _ai_service_manager is None:
+                _ai_service_manager = AIServiceManager()
+    return _ai_service_manager
 
 # Convenience functions for easy import
 def extract_skills_with_ai(resume_text: str) -> List[str]:
     """Extract skills from resume using AI."""
-    return ai_service_manager.extract_skills_with_ai(resume_text)
+    return _get_manager().extract_skills_with_ai(resume_text)
+
+def submit_skill_extraction_batch(resume_texts: List[str]) -> Optional[str]:
+    """Queue bulk skill extraction through the OpenAI Batch API."""
+    return _get_manager().submit_skill_extraction_batch(resume_texts)
+
+def collect_skill_extraction_batch(batch_id: str, resume_texts: List[str]) -> Optional[List[List[str]]]:
+    """Fetch bulk skill extraction results, or None while still running."""
+    return _get_manager().collect_skill_extraction_batch(batch_id, resume_texts)
+
+def run_ai_pipeline(resume_text: str, num_questions: int = 5, skill_gaps: List[str] = None) -> Dict[str, Any]:
+    """Extract skills, then generate questions and a learning path concurrently."""
+    return _get_manager().run_pipeline(resume_text, num_questions, skill_gaps)
+
+def stream_learning_path(skills: List[str], skill_gaps: List[str] = None) -> Iterator[Dict]:
+    """Yield personalized learning path modules as they are generated."""
+    return _get_manager().stream_learning_path(skills, skill_gaps)
 
 def generate_assessment_questions(skills: List[str], num_questions: int = 5) -> List[Dict]:
     """Generate assessment questions based on skills."""
-    return ai_service_manager.generate_assessment_questions(skills, num_questions)
+    return _get_manager().generate_assessment_questions(skills, num_questions)
 
 def generate_learning_path(skills: List[str], skill_gaps: List[str] = None) -> List[Dict]:
     """Generate personalized learning path."""
-    return ai_service_manager.generate_learning_path(skills, skill_gaps)
+    return _get_manager().generate_learning_path(skills, skill_gaps)
 
 def get_ai_service_status() -> Dict[str, Any]:
     """Get AI service availability status."""
-    return ai_service_manager.get_service_status()
\ No newline at end of file
+    return _get_manager().get_service_status()
\ No newline at end of file
@@ -7,22 +7,35 @@ Tests all endpoints and provides a detailed report
 import requests
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "http://localhost:5000"
+# Endpoints are requested concurrently, up to this many at a time
+MAX_WORKERS = 16
 
-def test_endpoint(method, endpoint, data=None, headers=None, expected_status=200):
+def make_session():
+    """Keep-alive session for the test run; cookies are dropped so every test starts logged out"""
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    session.mount("http://", HTTPAdapter(pool_maxsize=MAX_WORKERS))
+    return session
+
+def test_endpoint(method, endpoint, data=None, headers=None, expected_status=200, session=None):
     """Test a single endpoint and return results"""
+    http = session or requests
     try:
         url = f"{BASE_URL}{endpoint}"
         
         if method.upper() == 'GET':
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http.get(url, headers=headers, timeout=10)
         elif method.upper() == 'POST':
             if headers and 'application/json' in headers.get('Content-Type', ''):
-                response = requests.post(url, json=data, headers=headers, timeout=10)
+                response = http.post(url, json=data, headers=headers, timeout=10)
             else:
-                response = requests.post(url, data=data, headers=headers, timeout=10)
+                response = http.post(url, data=data, headers=headers, timeout=10)
         else:
             return {"error": f"Unsupported method: {method}"}
         
@@ -65,6 +78,8 @@ def main():
     print(f"Testing server at: {BASE_URL}")
     print(f"Test started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
+    
+    session = make_session()
 
     # Define test cases
     test_cases = [
@@ -95,15 +110,24 @@ def main():
         ("POST", "/submit_exercise", {"exercise_id": 1, "solution_code": "def test(): return True", "skill": "Python"}, {"Content-Type": "application/json"}, 401),  # Expected without session
     ]
 
-    # Run page tests
+    # Fire every request at once; results are reported in test case order
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        page_futures = [
+            executor.submit(test_endpoint, method, endpoint, expected_status=expected_status, session=session)
+            for method, endpoint, expected_status in test_cases
+        ]
+        api_futures = [
+            executor.submit(test_endpoint, method, endpoint, data, headers, expected_status, session=session)
+            for method, endpoint, data, headers, expected_status in api_test_cases
+        ]
+    page_results = [future.result() for future in page_futures]
+    api_results = [future.result() for future in api_futures]
+
+    # Report page tests
     print("📄 Testing Page Endpoints:")
     print("-" * 30)
     
-    page_results = []
-    for method, endpoint, expected_status in test_cases:
-        result = test_endpoint(method, endpoint, expected_status=expected_status)
-        page_results.append(result)
-        
+    for (method, endpoint, expected_status), result in zip(test_cases, page_results):
         status_icon = "✅" if result.get('success', False) else "❌"
         status_code = result.get('status_code', 'ERR')
         
@@ -117,11 +141,7 @@ def main():
     print("🔌 Testing API Endpoints:")
     print("-" * 30)
     
-    api_results = []
-    for method, endpoint, data, headers, expected_status in api_test_cases:
-        result = test_endpoint(method, endpoint, data, headers, expected_status)
-        api_results.append(result)
-        
+    for (method, endpoint, data, headers, expected_status), result in zip(api_test_cases, api_results):
         status_icon = "✅" if result.get('success', False) else "❌"
         status_code = result.get('status_code', 'ERR')
         
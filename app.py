@@ -7,6 +7,8 @@ from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
 
+from json_codec import loads
+
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 
@@ -27,7 +29,7 @@ def from_json_filter(value):
     """Parse JSON string in Jinja2 templates."""
     try:
         if isinstance(value, str):
-            return json.loads(value)
+            return loads(value)
         return value
     except (json.JSONDecodeError, TypeError):
         return {}
@@ -38,6 +40,15 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
     "pool_recycle": 300,
     "pool_pre_ping": True,
 }
+if (app.config["SQLALCHEMY_DATABASE_URI"] or "").startswith("postgres"):
+    # Steady pool covers every gunicorn thread (see gunicorn.conf.py), with
+    # overflow for request bursts; waiters give up after pool_timeout seconds
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"].update(
+        pool_size=16,
+        max_overflow=16,
+        pool_timeout=30,
+        connect_args={"application_name": "mavericks"},
+    )
 # initialize the app with the extension, flask-sqlalchemy >= 3.0.x
 db.init_app(app)
 
@@ -48,6 +59,14 @@ with app.app_context():
     
     db.create_all()
     logging.info("Database tables created successfully")
+    
+    # A failed conversion must never stop the app from booting
+    from backend.database import migrate_user_scores_to_jsonb
+    try:
+        if migrate_user_scores_to_jsonb():
+            logging.info("Converted user.scores to JSONB")
+    except Exception as e:
+        logging.error(f"user.scores JSONB migration skipped: {e}")
 
 # Initialize agent system
 from backend.agent_integration import init_agent_system
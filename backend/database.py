@@ -16,10 +16,46 @@ Each model includes:
 - Proper constraints and validation
 """
 
+import json
+import logging
 from app import db
-from sqlalchemy import DateTime, Text, Integer, String, Boolean, Float
+from sqlalchemy import DateTime, Text, Integer, String, Boolean, Float, inspect, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+
+class _LenientJSON(TypeDecorator):
+    """
+    JSONB on PostgreSQL; elsewhere JSON kept in a TEXT column. Legacy text
+    rows that are not valid JSON load as the raw string instead of failing
+    the whole query.
+    """
+    
+    impl = Text
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(Text())
+    
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        return json.dumps(value)
+    
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+
 
 class User(db.Model):
     """
@@ -39,7 +75,7 @@ class User(db.Model):
     
     # Core profile data extracted from resume
     skills = db.Column(db.Text)  # JSON string of extracted skills
-    scores = db.Column(db.Text)  # JSON string of assessment scores and responses
+    scores = db.Column(_LenientJSON)  # Assessment scores and responses (JSONB on PostgreSQL)
     resume_text = db.Column(db.Text)  # Original resume content for re-analysis
     
     # Timeline tracking - when important events happened
@@ -358,4 +394,55 @@ class ProgressTracking(db.Model):
     timestamp = db.Column(DateTime, default=datetime.utcnow)
     
     def __repr__(self):
-        return f'<ProgressTracking {self.username}: {self.activity_type}>'
\ No newline at end of file
+        return f'<ProgressTracking {self.username}: {self.activity_type}>'
+
+
+def _is_jsonb_compatible(value: str) -> bool:
+    """True if PostgreSQL can cast value to jsonb (valid JSON, no NaN/Infinity or NUL escapes)"""
+    def reject_constant(name):
+        raise ValueError(name)
+    try:
+        json.loads(value, parse_constant=reject_constant)
+    except ValueError:
+        return False
+    return "\\u0000" not in value
+
+
+def migrate_user_scores_to_jsonb() -> bool:
+    """
+    Convert user.scores from its original TEXT column to JSONB on PostgreSQL.
+    
+    db.create_all() never alters existing tables, so this runs at startup and
+    is a no-op once the column is JSONB (or on other databases). Rows that
+    are not valid JSON (legacy plain-text scores, damaged records) are first
+    rewritten as JSON strings so the cast cannot fail on them. If the
+    conversion still fails, it is rolled back and logged and the column stays
+    TEXT. Returns True if the column was converted.
+    """
+    engine = db.engine
+    if engine.dialect.name != "postgresql":
+        return False
+    
+    columns = {column["name"]: column["type"] for column in inspect(engine).get_columns("user")}
+    if "scores" not in columns or isinstance(columns["scores"], JSONB):
+        return False
+    
+    try:
+        with engine.begin() as connection:
+            rows = connection.execute(text('SELECT id, scores FROM "user" WHERE scores IS NOT NULL')).all()
+            for user_id, scores in rows:
+                if scores.strip() and not _is_jsonb_compatible(scores):
+                    connection.execute(
+                        text('UPDATE "user" SET scores = :scores WHERE id = :id'),
+                        {"scores": json.dumps(scores), "id": user_id}
+                    )
+            connection.execute(text("""
+                ALTER TABLE "user" ALTER COLUMN scores TYPE jsonb USING CASE
+                    WHEN btrim(scores) = '' THEN NULL
+                    ELSE scores::jsonb
+                END
+            """))
+    except SQLAlchemyError as e:
+        logger.error(f"Could not convert user.scores to JSONB, keeping TEXT: {e}")
+        return False
+    return True
@@ -41,6 +41,8 @@ from flask import render_template, request, redirect, url_for, flash, session, j
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 
+from json_codec import dumps as _dumps, loads as _loads
+
 # Import services and database models
 from backend.services import (
     extract_text_from_file, allowed_file, extract_skills_from_resume,
@@ -53,6 +55,20 @@ from app import app, db, agent_system
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 
+def _user_scores(user) -> Any:
+    """
+    Decoded user.scores. The column normally hands back a dict, but rows
+    read while it is still TEXT (JSONB conversion pending or failed) come
+    back as JSON strings and are parsed here; anything else is returned as is.
+    """
+    scores = user.scores
+    if isinstance(scores, str):
+        try:
+            return _loads(scores)
+        except json.JSONDecodeError:
+            return scores
+    return scores
+
 # Missing API route - add this
 @app.route('/api/recent-activities')
 def api_recent_activities():
@@ -476,18 +492,18 @@ def assessment_panel():
         
         # Update user record with assessment results
         user = User.query.filter_by(username=username).first()
-        user.scores = json.dumps(score_data)
+        user.scores = score_data
         user.assessment_completed_at = datetime.utcnow()
         
         # Create detailed assessment attempt record
         assessment_attempt = AssessmentAttempt(
             username=username,
             completed_at=datetime.utcnow(),
-            questions_data=json.dumps({'questions': list(quiz_responses.keys())}),
-            responses_data=json.dumps(quiz_responses),
+            questions_data=_dumps({'questions': list(quiz_responses.keys())}),
+            responses_data=_dumps(quiz_responses),
             total_score=final_score,
-            skill_breakdown=json.dumps(score_breakdown),
-            evaluation_data=json.dumps({
+            skill_breakdown=_dumps(score_breakdown),
+            evaluation_data=_dumps({
                 'algorithm_version': '2.0',
                 'scoring_components': score_breakdown,
                 'recommendations': _generate_assessment_recommendations(final_score, score_breakdown)
@@ -731,19 +747,19 @@ def progress(username=None):
             logger.warning(f"Progress requested for non-existent user: {username}")
             return redirect(url_for('profile'))
         
-        # Parse assessment scores if available
+        # Assessment scores come back from the JSON column already decoded
         score_data = None
-        if user_data.scores:
+        scores = _user_scores(user_data)
+        if isinstance(scores, dict):
+            score_data = scores
+            logger.info(f"Progress displayed for {username} - Score: {score_data.get('total_score', 'N/A')}")
+        elif scores:
+            # Handle legacy format (simple score string)
             try:
-                score_data = json.loads(user_data.scores)
-                logger.info(f"Progress displayed for {username} - Score: {score_data.get('total_score', 'N/A')}")
-            except json.JSONDecodeError:
-                # Handle legacy format (simple score string)
-                try:
-                    score_data = {'total_score': int(user_data.scores), 'responses': {}}
-                    logger.warning(f"Legacy score format detected for {username}")
-                except ValueError:
-                    score_data = None
+                score_data = {'total_score': int(scores), 'responses': {}}
+                logger.warning(f"Legacy score format detected for {username}")
+            except (ValueError, TypeError):
+                score_data = None
         
         # Get learning path progress
         learning_paths = LearningPath.query.filter_by(username=username).all()
@@ -988,13 +1004,13 @@ def api_progress(username):
         if not user_data:
             return jsonify({'error': 'User not found'}), 404
         
-        # Parse scores safely
+        # Scores are stored as JSON; anything else is a legacy plain score
         score_data = None
-        if user_data.scores:
-            try:
-                score_data = json.loads(user_data.scores)
-            except json.JSONDecodeError:
-                score_data = {'total_score': user_data.scores}
+        scores = _user_scores(user_data)
+        if isinstance(scores, dict):
+            score_data = scores
+        elif scores:
+            score_data = {'total_score': scores}
         
         # Get learning path summary
         learning_paths = LearningPath.query.filter_by(username=username).all()
@@ -1150,8 +1166,8 @@ def leaderboard():
         for user in all_users:
             if user.scores:
                 try:
-                    score_data = json.loads(user.scores) if isinstance(user.scores, str) else user.scores
-                    score = score_data.get('total_score', 0) if isinstance(score_data, dict) else int(user.scores)
+                    score_data = _user_scores(user)
+                    score = score_data.get('total_score', 0) if isinstance(score_data, dict) else int(score_data)
                     users_with_scores.append({
                         'username': user.username,
                         'score': score,
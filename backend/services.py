@@ -44,6 +44,8 @@ from io import BytesIO
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 
+from skill_matching import COMMON_SKILLS, find_skills
+
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 
@@ -60,15 +62,6 @@ except ImportError as e:
 ALLOWED_EXTENSIONS = {'txt', 'pdf', 'doc', 'docx'}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB maximum file size
 
-# Constants for skill extraction
-COMMON_SKILLS = [
-    'python', 'java', 'javascript', 'react', 'flask', 'django', 'sql', 'html', 'css', 'git',
-    'node.js', 'angular', 'vue', 'postgresql', 'mysql', 'mongodb', 'docker', 'kubernetes',
-    'aws', 'azure', 'machine learning', 'data science', 'api', 'rest', 'microservices',
-    'typescript', 'c++', 'c#', 'ruby', 'php', 'golang', 'rust', 'swift', 'tensorflow',
-    'pytorch', 'redis', 'elasticsearch', 'jenkins', 'gitlab', 'linux', 'bash'
-]
-
 # Constants for assessment scoring
 TECHNICAL_KEYWORDS = [
     'algorithm', 'database', 'framework', 'api', 'testing', 'debugging', 'optimization',
@@ -250,9 +243,11 @@ def extract_skills_from_resume(resume_text: str) -> str:
         'other': []
     }
     
+    mentioned = find_skills(resume_lower)
+    
     # Categorize skills as we find them
     for skill in COMMON_SKILLS:
-        if skill.lower() in resume_lower:
+        if skill in mentioned:
             skill_title = skill.title()
             found_skills.append(skill_title)
             
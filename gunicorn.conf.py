@@ -0,0 +1,23 @@
+"""
+Gunicorn settings, picked up automatically from the working directory by
+both the workflow (start.sh) and the deployment command in .replit.
+
+Most request time is spent waiting on LLM providers, so each worker runs a
+pool of threads instead of a single synchronous handler. Agent state and
+AI response caches live in process memory, so the worker count stays at
+one unless WEB_CONCURRENCY says otherwise.
+"""
+
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+worker_class = "gthread"
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 16))
+
+# With gthread workers this only bounds an unresponsive worker process, not a
+# single request: an AI pipeline call can try up to three providers at
+# PIPELINE_TIMEOUT (40s) each before falling back to templates
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
@@ -0,0 +1,28 @@
+"""
+JSON Codec
+==========
+
+dumps/loads shared by the AI services, the course generator and the route
+handlers. orjson is used when installed; its decode errors subclass
+json.JSONDecodeError, so callers catch the same exception either way.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; falls back to the stdlib json codec
+    orjson = None
+
+def dumps(data: Any) -> str:
+    """Serialize data to a JSON string, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data)
+
+def loads(data) -> Any:
+    """Parse a JSON str or bytes payload, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
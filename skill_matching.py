@@ -0,0 +1,97 @@
+"""
+Skill Keyword Matching
+======================
+
+Keyword table and scanner shared by the resume skill extractors in
+ai_services and backend.services, so both recognise the same skills.
+"""
+
+import re
+from typing import Callable, Mapping, Set
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; falls back to a single regex scan
+    ahocorasick = None
+
+# Canonical skills, in output order
+COMMON_SKILLS = (
+    'python', 'java', 'javascript', 'react', 'flask', 'django', 'sql', 'html', 'css', 'git',
+    'node.js', 'angular', 'vue', 'postgresql', 'mysql', 'mongodb', 'docker', 'kubernetes',
+    'aws', 'azure', 'machine learning', 'data science', 'api', 'rest', 'microservices',
+    'typescript', 'c++', 'c#', 'ruby', 'php', 'golang', 'rust', 'swift', 'tensorflow',
+    'pytorch', 'redis', 'elasticsearch', 'jenkins', 'gitlab', 'linux', 'bash'
+)
+
+# Abbreviations, spellings and inflections that count as the canonical skill
+SKILL_ALIASES = {
+    'javascript': ('js', 'ecmascript'),
+    'typescript': ('ts',),
+    'react': ('react.js', 'reactjs'),
+    'node.js': ('nodejs',),
+    'angular': ('angularjs', 'angular.js'),
+    'vue': ('vue.js', 'vuejs'),
+    'git': ('github',),
+    'postgresql': ('postgres', 'psql'),
+    'mongodb': ('mongo',),
+    'docker': ('dockerized', 'dockerfile'),
+    'kubernetes': ('k8s',),
+    'aws': ('amazon web services',),
+    'machine learning': ('ml',),
+    'api': ('apis',),
+    'rest': ('restful',),
+    'microservices': ('microservice', 'micro-services'),
+    'c++': ('cpp',),
+    'c#': ('csharp', 'c sharp'),
+    'golang': ('go lang',),
+    'elasticsearch': ('elastic search',),
+}
+
+# Every matchable keyword -> the skill it stands for
+SKILL_KEYWORDS = {skill: skill for skill in COMMON_SKILLS}
+SKILL_KEYWORDS.update(
+    (alias, skill) for skill, aliases in SKILL_ALIASES.items() for alias in aliases
+)
+
+def _is_standalone(text: str, start: int, end: int) -> bool:
+    """
+    True if text[start:end] does not continue a word or follow a dot on the
+    left (so the "js" in "node.js" is not a match of its own) and is not
+    followed by a letter, so "python3" counts but "java" in "javascript" does not
+    """
+    return (
+        (start == 0 or not (text[start - 1].isalnum() or text[start - 1] == "."))
+        and (end == len(text) or not "a" <= text[end] <= "z")
+    )
+
+def build_skill_matcher(keywords: Mapping[str, str]) -> Callable[[str], Set[str]]:
+    """
+    Build a scanner that returns the skills whose keywords appear standalone
+    in lowercased text. With pyahocorasick, one automaton pass finds every
+    keyword; otherwise a single alternation (longest keyword first, so
+    "javascript" wins over "java") applies the same _is_standalone rule,
+    which also works for "c++", "c#" and "node.js" where \\b would not.
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword, skill in keywords.items():
+            automaton.add_word(keyword, (len(keyword), skill))
+        automaton.make_automaton()
+
+        def find_skills(text: str) -> Set[str]:
+            return {
+                skill for end, (length, skill) in automaton.iter(text)
+                if _is_standalone(text, end - length + 1, end + 1)
+            }
+    else:
+        pattern = re.compile(
+            r"(?<![^\W_]|\.)(?:" + "|".join(map(re.escape, sorted(keywords, key=len, reverse=True))) + r")(?![a-z])"
+        )
+
+        def find_skills(text: str) -> Set[str]:
+            return {keywords[keyword] for keyword in pattern.findall(text)}
+
+    return find_skills
+
+# Scanner over the shared keyword table
+find_skills = build_skill_matcher(SKILL_KEYWORDS)